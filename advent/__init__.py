@@ -0,0 +1,10 @@
+"""Helpers for running the daily solutions from a single process.
+
+Each `dayN/python/{first,second}.py` script exposes a `solve(stream)`
+function which returns the answer for its part, and still works as a
+standalone script reading from `stdin`. The modules in this package load
+those scripts on demand so many of them can be run without paying for a
+fresh interpreter each time:
+
+    python3 -m advent run --day 15 --part 2 --input day15/input.txt
+"""
@@ -0,0 +1,199 @@
+import argparse
+import inspect
+import os
+import sys
+import time
+from pathlib import Path
+
+from advent import batch, bench
+from advent.solvers import (available_solvers, has_solver, input_files, is_puzzle_input,
+                            load_solver, run_solver)
+
+
+def select_jobs(days, parts):
+    """Return (day, part) pairs to run, defaulting to everything available."""
+    if days:
+        return [(day, part) for day in days for part in (parts or (1, 2))
+                if parts or has_solver(day, part)]
+    return [(day, part) for day, part in available_solvers()
+            if not parts or part in parts]
+
+
+def select_inputs(day, part, which):
+    if not has_solver(day, part):
+        raise LookupError(f"no solver for day {day} part {part}")
+    for input_path in input_files(day, part):
+        if which == "all" or (which == "puzzle") == is_puzzle_input(input_path):
+            yield input_path
+
+
+def solver_options(solve, args):
+    """Return the keyword arguments from the command line that `solve` takes."""
+    parameters = inspect.signature(solve).parameters
+    return {name: value for name, value in (("workers", args.workers),)
+            if value is not None and name in parameters}
+
+
+def cmd_run(args):
+    jobs = select_jobs(args.day, args.part)
+    if args.input == "-" and len(jobs) > 1:
+        raise SystemExit("can only read stdin for a single day and part")
+    for day, part in jobs:
+        solve = load_solver(day, part)
+        options = solver_options(solve, args)
+        if args.input == "-":
+            answer = solve(sys.stdin, **options)
+        else:
+            answer = run_solver(day, part, args.input, **options)
+        if len(jobs) == 1:
+            print(answer)
+        else:
+            print(f"Day {day} part {part}: {answer}")
+
+
+def cmd_bench(args):
+    expected = bench.load_json(bench.ANSWERS_PATH, {})
+    results = {}
+    for day, part in select_jobs(args.day, args.part):
+        for input_path in select_inputs(day, part, args.inputs):
+            key = bench.job_key(day, part, input_path)
+            results[key] = bench.measure(day, part, input_path, args.warmup, args.repeat,
+                                         args.timeout)
+            print(bench.format_result(key, results[key]), flush=True)
+
+    failed = False
+    for key, want, got in bench.find_wrong_answers(results, expected):
+        print(f"WRONG ANSWER {key}: expected {want!r}, got {got!r}")
+        failed = True
+    if any(i["status"] != "ok" for i in results.values()):
+        failed = True
+
+    if args.baseline:
+        baseline = bench.load_json(bench.baseline_path(args.baseline))
+        if baseline is None:
+            raise SystemExit(f"no stored baseline for revision {args.baseline}")
+        for key, old, new in bench.find_regressions(results, baseline, args.threshold / 100):
+            print(f"REGRESSION {key}: {old * 1000:.2f}ms -> {new * 1000:.2f}ms "
+                  f"({(new / old - 1) * 100:+.1f}%)")
+            failed = True
+
+    if args.update_answers:
+        expected.update((key, result["answer"]) for key, result in results.items()
+                        if result["status"] == "ok")
+        bench.save_json(bench.ANSWERS_PATH, expected)
+    if args.save:
+        print(f"Saved {bench.save_baseline(results, args.warmup, args.repeat)}")
+    if failed:
+        raise SystemExit(1)
+
+
+def cmd_batch(args):
+    expected = bench.load_json(bench.ANSWERS_PATH, {})
+    jobs = [batch.Job(day, part, input_path)
+            for day, part in select_jobs(args.day, args.part)
+            for input_path in select_inputs(day, part, args.inputs)]
+
+    def report(job, result):
+        key = bench.job_key(*job)
+        if result["status"] == "ok" and key in expected and result["answer"] != expected[key]:
+            result["status"] = "wrong"
+            result["expected"] = expected[key]
+        seconds = "" if result["seconds"] is None else f"{result['seconds']:9.2f}s"
+        print(f"{key:<36} {result['status'].upper():<8} {seconds}", flush=True)
+
+    start = time.perf_counter()
+    results = batch.run_batch(jobs, args.workers, args.timeout, report)
+    elapsed = time.perf_counter() - start
+
+    failures = [job for job, result in results.items() if result["status"] != "ok"]
+    busy = sum(result["seconds"] or 0 for result in results.values())
+    print(f"{len(results)} jobs, {len(failures)} failed, {elapsed:.2f}s elapsed, "
+          f"{busy:.2f}s of solver time")
+    for job in sorted(failures, key=batch.job_priority):
+        result = results[job]
+        detail = result.get("error") or (f"expected {result['expected']!r}, got {result['answer']!r}"
+                                         if result["status"] == "wrong" else "")
+        print(f"{result['status'].upper()} {bench.job_key(*job)} {detail}".rstrip())
+
+    if args.report:
+        bench.save_json(args.report, {
+            "elapsed": elapsed,
+            "workers": args.workers or os.cpu_count(),
+            "results": {bench.job_key(*job): result for job, result in results.items()},
+        })
+    if failures:
+        raise SystemExit(1)
+
+
+def positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="advent")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_job_arguments(subparser):
+        subparser.add_argument("--day", type=int, action="append",
+                               help="day to run (repeatable, default all)")
+        subparser.add_argument("--part", type=int, action="append", choices=(1, 2),
+                               help="part to run (repeatable, default both)")
+
+    def add_inputs_argument(subparser):
+        subparser.add_argument("--inputs", choices=("all", "puzzle", "samples"), default="all",
+                               help="which input files to use (default: all)")
+
+    run_parser = commands.add_parser("run", help="run solvers in this process")
+    add_job_arguments(run_parser)
+    run_parser.add_argument("--input",
+                            help="input file, or - for stdin (default: puzzle input)")
+    run_parser.add_argument("--workers", type=positive_int,
+                            help="worker processes, for solvers which can use them")
+    run_parser.set_defaults(func=cmd_run)
+
+    bench_parser = commands.add_parser("bench", help="time solvers against their inputs")
+    add_job_arguments(bench_parser)
+    add_inputs_argument(bench_parser)
+    bench_parser.add_argument("--warmup", type=int, default=1,
+                              help="untimed runs before timing (default: 1)")
+    bench_parser.add_argument("--repeat", type=positive_int, default=5,
+                              help="timed runs per job (default: 5)")
+    bench_parser.add_argument("--timeout", type=float,
+                              help="give up on a job after this many seconds")
+    bench_parser.add_argument("--baseline", metavar="REVISION",
+                              help="flag regressions against this stored revision")
+    bench_parser.add_argument("--threshold", type=float, default=10.0,
+                              help="percentage slowdown that counts as a regression (default: 10)")
+    bench_parser.add_argument("--save", action="store_true",
+                              help="store results as the baseline for the current revision")
+    bench_parser.add_argument("--update-answers", action="store_true",
+                              help="record these answers as the expected ones")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    batch_parser = commands.add_parser("batch", help="run solvers in parallel and check answers")
+    add_job_arguments(batch_parser)
+    add_inputs_argument(batch_parser)
+    batch_parser.add_argument("--workers", type=positive_int,
+                              help="number of worker processes (default: CPU count)")
+    batch_parser.add_argument("--timeout", type=float,
+                              help="give up on a job after this many seconds")
+    batch_parser.add_argument("--report", type=Path,
+                              help="also write the results to this JSON file")
+    batch_parser.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except LookupError as exc:
+        raise SystemExit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Run many solver jobs in parallel across a pool of worker processes.
+
+Jobs are (day, part, input file) triples. The known slow jobs are
+submitted first so they don't end up as stragglers holding up the end of
+the batch. Each job gets its own timeout, enforced inside the worker with
+an interval timer, and a job that raises is reported as an error without
+affecting any of the others. The timer can't interrupt a job stuck inside
+C code, so the parent also keeps a deadline for each job and kills the
+worker if it's passed.
+
+A worker which dies outright (e.g. killed by the OOM killer) breaks the
+whole pool, taking every unfinished job with it. Workers report each job
+as they start it, so the jobs which were running at the time are the
+only suspects. If there was just one, that's the one which crashed.
+Otherwise everything unfinished goes to a fresh pool of the same size, and
+only jobs which were running when a pool broke for a second time are
+re-run one at a time in their own single-worker pool, so the job
+responsible is the only one reported as crashed.
+"""
+
+import multiprocessing
+import os
+import signal
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import NamedTuple
+
+from advent.solvers import is_puzzle_input, load_solver
+
+# Slowest first, going by the benchmark timings for the puzzle inputs (the
+# samples for these tend to be slow too). A part of None covers both parts.
+SLOW_JOBS = ((19, None), (24, 2), (21, 2), (15, 2), (23, 2), (23, 1), (22, 2), (18, 2), (24, 1))
+
+# How long past its timeout a job gets before the parent kills its worker,
+# and how often the parent checks.
+KILL_GRACE = 5.0
+POLL_INTERVAL = 0.5
+
+# Set in each worker to the queue it reports job starts on.
+_started_queue = None
+
+
+class Job(NamedTuple):
+    day: int
+    part: int
+    input_path: Path
+
+
+class JobTimeoutError(BaseException):
+    """Raised in a worker when its job runs out of time.
+
+    This isn't an Exception, so solvers catching those don't swallow it.
+    """
+
+
+def job_priority(job):
+    """Sort key which puts the known slow jobs at the front."""
+    for rank, (day, part) in enumerate(SLOW_JOBS):
+        if job.day == day and part in (None, job.part):
+            break
+    else:
+        rank = len(SLOW_JOBS)
+    # Within a day, the puzzle input is generally the slowest.
+    return (rank, not is_puzzle_input(job.input_path), job.day, job.part,
+            job.input_path.name)
+
+
+def _raise_timeout(signum, frame):
+    raise JobTimeoutError()
+
+
+def _init_worker(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _run_job(job, timeout):
+    # SimpleQueue writes straight to the pipe, so the parent hears about the
+    # job even if the worker dies moments later.
+    _started_queue.put((job, os.getpid()))
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        solve = load_solver(job.day, job.part)
+        with open(job.input_path) as fd:
+            answer = solve(fd)
+    except JobTimeoutError:
+        return {"status": "timeout", "seconds": time.perf_counter() - start}
+    except Exception as exc:
+        return {"status": "error", "error": repr(exc), "seconds": time.perf_counter() - start}
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return {"status": "ok", "answer": str(answer), "seconds": time.perf_counter() - start}
+
+
+def _run_pool(jobs, workers, timeout, on_result):
+    """Run jobs in one pool.
+
+    Returns (lost, suspects): the jobs lost to a broken pool, and which of
+    those were running when it broke. A pool broken by killing a job that
+    ran out of time has no suspects.
+    """
+    context = multiprocessing.get_context()
+    started_queue = context.SimpleQueue()
+    lost = []
+    running = {}
+    finished = set()
+    timed_out = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(started_queue,)) as executor:
+        futures = {executor.submit(_run_job, job, timeout): job for job in jobs}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, POLL_INTERVAL, FIRST_COMPLETED)
+            while not started_queue.empty():
+                job, pid = started_queue.get()
+                if job not in finished:
+                    running[job] = (pid, time.monotonic())
+            for future in done:
+                job = futures[future]
+                finished.add(job)
+                if job in timed_out:
+                    on_result(job, {"status": "timeout", "seconds": timed_out[job]})
+                    continue
+                try:
+                    on_result(job, future.result())
+                    running.pop(job, None)
+                except BrokenProcessPool:
+                    lost.append(job)
+            if timeout:
+                now = time.monotonic()
+                for job, (pid, start) in running.items():
+                    if job in finished or job in timed_out or now - start <= timeout + KILL_GRACE:
+                        continue
+                    timed_out[job] = now - start
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+    if timed_out:
+        return lost, []
+    suspects = [job for job in lost if job in running]
+    return lost, suspects or lost
+
+
+def run_batch(jobs, workers=None, timeout=None, on_result=None):
+    """Run every job and return a dict mapping each Job to its result.
+
+    `on_result(job, result)` is called as each job finishes, which is
+    handy for reporting progress.
+    """
+    results = {}
+
+    def record(job, result):
+        results[job] = result
+        if on_result is not None:
+            on_result(job, result)
+
+    def crashed(job):
+        record(job, {"status": "crashed", "seconds": None})
+
+    breaks = Counter()
+    isolated = []
+    queue = sorted(jobs, key=job_priority)
+    while queue:
+        lost, suspects = _run_pool(queue, workers, timeout, record)
+        if len(suspects) == 1:
+            crashed(suspects[0])
+            lost.remove(suspects[0])
+        else:
+            breaks.update(suspects)
+            isolated.extend(job for job in suspects if breaks[job] > 1)
+        queue = [job for job in lost if job not in isolated]
+    for job in sorted(isolated, key=job_priority):
+        if _run_pool([job], 1, timeout, record)[0]:
+            crashed(job)
+    return results
@@ -0,0 +1,175 @@
+"""Time solvers against their inputs and compare with stored baselines.
+
+Each (day, part, input file) job is benchmarked in a fresh worker process,
+so the peak RSS reported belongs to that job alone. Inside the worker the
+solver is imported, run a few times to warm up, and then timed over a
+number of repeats.
+
+Results are saved as JSON in `benchmarks/`, one file per git revision.
+Known-good answers live in `benchmarks/answers.json`, and every run is
+checked against them so a faster solver can't slip in a wrong answer.
+"""
+
+import json
+import math
+import multiprocessing
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from advent.solvers import ROOT, load_solver
+
+BENCH_DIR = ROOT / "benchmarks"
+ANSWERS_PATH = BENCH_DIR / "answers.json"
+
+
+def job_key(day, part, input_path):
+    return f"day{day}/part{part}/{input_path.name}"
+
+
+def percentile(values, pct):
+    # Nearest-rank, which behaves sensibly for the handful of samples we take.
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_kib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _time_solver(day, part, input_path, warmup, repeat):
+    solve = load_solver(day, part)
+    for i in range(warmup):
+        with open(input_path) as fd:
+            solve(fd)
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        with open(input_path) as fd:
+            answer = solve(fd)
+        timings.append(time.perf_counter() - start)
+    return str(answer), timings, peak_rss_kib()
+
+
+def _bench_worker(conn, args):
+    try:
+        conn.send(("ok", _time_solver(*args)))
+    except Exception as exc:
+        conn.send(("error", repr(exc)))
+    finally:
+        conn.close()
+
+
+def measure(day, part, input_path, warmup=1, repeat=5, timeout=None):
+    """Benchmark a single job in its own process and return a result dict."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    worker = multiprocessing.Process(target=_bench_worker,
+                                     args=(sender, (day, part, input_path, warmup, repeat)))
+    worker.start()
+    # Only the worker holds the sending end now, so if it dies without
+    # sending anything (e.g. killed by the OOM killer) we get EOF rather
+    # than waiting forever.
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            return {"status": "timeout"}
+        status, value = receiver.recv()
+    except EOFError:
+        worker.join()
+        return {"status": "crashed", "error": f"exit code {worker.exitcode}"}
+    finally:
+        # This is also what stops a job that has run past its timeout.
+        worker.kill()
+        worker.join()
+        receiver.close()
+    if status == "error":
+        return {"status": "error", "error": value}
+    answer, timings, peak_rss = value
+    return {
+        "status": "ok",
+        "answer": answer,
+        "median": statistics.median(timings),
+        "p95": percentile(timings, 95),
+        "min": min(timings),
+        "runs": len(timings),
+        "peak_rss_kib": peak_rss,
+    }
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        changes = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                 cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return revision + "-dirty" if changes.strip() else revision
+
+
+def baseline_path(revision):
+    return BENCH_DIR / f"{revision}.json"
+
+
+def load_json(path, default=None):
+    try:
+        with open(path) as fd:
+            return json.load(fd)
+    except FileNotFoundError:
+        return default
+
+
+def save_json(path, data):
+    path.parent.mkdir(exist_ok=True)
+    with open(path, "w") as fd:
+        json.dump(data, fd, indent=2, sort_keys=True)
+        fd.write("\n")
+
+
+def save_baseline(results, warmup, repeat, revision=None):
+    revision = revision or git_revision()
+    path = baseline_path(revision)
+    save_json(path, {
+        "revision": revision,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "warmup": warmup,
+        "repeat": repeat,
+        "results": results,
+    })
+    return path
+
+
+def find_regressions(results, baseline, threshold):
+    """Yield (key, old_median, new_median) for jobs slower than baseline.
+
+    `threshold` is the fractional slowdown tolerated, so 0.1 allows jobs
+    to get up to 10% slower before they're flagged.
+    """
+    old_results = baseline["results"]
+    for key, result in results.items():
+        old = old_results.get(key)
+        if result["status"] != "ok" or old is None or old["status"] != "ok":
+            continue
+        if result["median"] > old["median"] * (1 + threshold):
+            yield key, old["median"], result["median"]
+
+
+def find_wrong_answers(results, expected):
+    """Yield (key, expected, actual) for answers that don't match."""
+    for key, result in results.items():
+        if result["status"] == "ok" and key in expected and result["answer"] != expected[key]:
+            yield key, expected[key], result["answer"]
+
+
+def format_result(key, result):
+    if result["status"] != "ok":
+        return f"{key:<36} {result['status'].upper()} {result.get('error', '')}".rstrip()
+    return (f"{key:<36} median={result['median'] * 1000:10.2f}ms "
+            f"p95={result['p95'] * 1000:10.2f}ms rss={result['peak_rss_kib']:8d}KiB")
@@ -0,0 +1,218 @@
+"""Parse puzzle input straight from bytes, without a `str` per line.
+
+Everything here takes the same `stream` the solvers are given, and parses
+whatever's left of it from its current position. If that's the start of a
+regular file (including `stdin` redirected from one) it's memory-mapped;
+otherwise the rest is read in one go. Either way the parsing works
+over the raw buffer, which is a lot quicker than decoding, stripping and
+splitting each line in Python once the inputs get large.
+"""
+
+from contextlib import contextmanager
+import mmap
+import os
+import stat
+from typing import NamedTuple
+
+# For use with bytes.translate(). The first maps ASCII digits to their
+# values, the second blanks out everything which can't be part of an int.
+DIGIT_TABLE = bytes((i - ord("0")) % 256 for i in range(256))
+INT_CHARS_TABLE = bytes(i if i == ord("-") or ord("0") <= i <= ord("9") else ord(" ")
+                        for i in range(256))
+
+
+def _source(stream):
+    """Return what to read the rest of a stream from.
+
+    That's the raw binary buffer under a text stream if nothing's been read
+    from it yet. Once anything has, the buffer has usually read ahead of
+    the text, so the text stream itself has to be read (and encoded).
+    """
+    buffer = getattr(stream, "buffer", None)
+    if buffer is not None:
+        try:
+            if stream.tell() == 0:
+                return buffer
+        except (OSError, ValueError):
+            # Not seekable, so there's no telling.
+            pass
+    return stream
+
+
+def read_buffer(stream):
+    """Return the rest of a stream as a bytes-like object.
+
+    This may be an mmap, which the caller should close when done with it;
+    open_buffer() takes care of that.
+    """
+    try:
+        fileno = stream.fileno()
+        info = os.fstat(fileno)
+        # Once anything's been read, a text stream's buffer has usually read
+        # ahead of it, so the file can only be mapped from the start.
+        at_start = stream.tell() == 0
+    except (AttributeError, OSError, ValueError):
+        # Not backed by a real file (e.g. io.StringIO), or not seekable.
+        pass
+    else:
+        if at_start and stat.S_ISREG(info.st_mode) and info.st_size > 0:
+            return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    data = _source(stream).read()
+    return data.encode() if isinstance(data, str) else data
+
+
+@contextmanager
+def open_buffer(stream):
+    """Context manager giving read_buffer(stream), closing it afterwards."""
+    buffer = read_buffer(stream)
+    try:
+        yield buffer
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            try:
+                buffer.close()
+            except BufferError:
+                # Views of it are still in use, and it's unmapped once
+                # they're all gone.
+                pass
+
+
+def lines(stream):
+    """Yield each non-empty line as a zero-copy memoryview, minus its newline."""
+    with open_buffer(stream) as buffer, memoryview(buffer) as view:
+        start = 0
+        end = len(buffer)
+        while start < end:
+            newline = buffer.find(b"\n", start)
+            if newline < 0:
+                newline = end
+            line_end = newline
+            if line_end > start and view[line_end - 1] == ord("\r"):
+                line_end -= 1
+            if line_end > start:
+                yield view[start:line_end]
+            start = newline + 1
+
+
+def ints(stream):
+    """Return every integer in the input, in order, as a flat list.
+
+    This covers one-value-per-line inputs as well as comma-separated ones,
+    and also lines like "0,9 -> 5,9" where only the numbers matter.
+    """
+    with open_buffer(stream) as buffer:
+        tokens = buffer[:].translate(INT_CHARS_TABLE).split()
+    if b"-" in tokens:
+        # Left behind by separators such as "->".
+        tokens = [i for i in tokens if i != b"-"]
+    return list(map(int, tokens))
+
+
+def int_token_chunks(stream, chunk_size=1 << 22):
+    """Yield lists of integer tokens (as bytes), reading a chunk at a time.
+
+    Unlike ints() this never holds more than about `chunk_size` bytes of
+    the input, so it copes with inputs far larger than memory. A token
+    which straddles two chunks is carried over into the next one.
+    """
+    raw = _source(stream)
+    leftover = b""
+    while True:
+        chunk = raw.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        tokens = (leftover + chunk).translate(INT_CHARS_TABLE).split()
+        leftover = b""
+        if tokens and chunk[-1:].translate(INT_CHARS_TABLE) != b" ":
+            leftover = tokens.pop()
+        if b"-" in tokens:
+            tokens = [i for i in tokens if i != b"-"]
+        if tokens:
+            yield tokens
+    if leftover and leftover != b"-":
+        yield [leftover]
+
+
+def line_chunks(stream, chunk_size=1 << 22):
+    """Yield the input as bytes chunks of roughly `chunk_size`, split only
+    at line boundaries so every chunk holds whole lines."""
+    raw = _source(stream)
+    leftover = b""
+    while True:
+        chunk = raw.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        chunk = leftover + chunk
+        cut = chunk.rfind(b"\n") + 1
+        leftover = chunk[cut:]
+        if cut:
+            yield chunk[:cut]
+    if leftover.strip():
+        yield leftover
+
+
+def iter_ints(stream, chunk_size=1 << 22):
+    """Yield every integer in the input, in bounded memory."""
+    for tokens in int_token_chunks(stream, chunk_size):
+        yield from map(int, tokens)
+
+
+def iter_lines(stream):
+    """Yield each non-empty line as bytes, minus its newline, one at a time.
+
+    This reads the stream as it goes rather than mapping or reading it all
+    up front, so only the current line is ever held.
+    """
+    for line in _source(stream):
+        if isinstance(line, str):
+            line = line.encode()
+        line = line.rstrip(b"\r\n")
+        if line:
+            yield line
+
+
+def comma_ints(stream):
+    """Return the comma-separated integers on the first line of the input."""
+    with open_buffer(stream) as buffer:
+        newline = buffer.find(b"\n")
+        return [int(i) for i in buffer[:newline if newline >= 0 else len(buffer)].split(b",")]
+
+
+class DigitGrid(NamedTuple):
+    """A rectangular grid of single digits, stored flat in row-major order."""
+    width: int
+    height: int
+    cells: bytearray
+
+    def row_views(self):
+        """Return a zero-copy memoryview of each row."""
+        view = memoryview(self.cells)
+        return [view[i:i + self.width] for i in range(0, len(self.cells), self.width)]
+
+    def rows(self):
+        """Return each row as a list of ints.
+
+        Solvers which index the grid heavily are quicker with plain lists
+        than memoryviews, and building them straight from the bytes is
+        still far cheaper than converting one character at a time.
+        """
+        cells = self.cells
+        return [list(cells[i:i + self.width]) for i in range(0, len(cells), self.width)]
+
+
+def digit_grid(stream):
+    """Parse a grid of digits such as "2199943210" into a DigitGrid."""
+    with open_buffer(stream) as buffer:
+        width = buffer.find(b"\n")
+        if width < 0:
+            width = len(buffer)
+        elif width > 0 and buffer[width - 1] == ord("\r"):
+            width -= 1
+        cells = bytearray(buffer[:]).translate(DIGIT_TABLE, b"\r\n")
+    if not width or len(cells) % width:
+        raise ValueError("digit grid rows must all be the same length")
+    return DigitGrid(width, len(cells) // width, cells)
@@ -0,0 +1,125 @@
+"""Locate and lazily import the per-day solver scripts."""
+
+import importlib.util
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PARTS = {1: "first", 2: "second"}
+
+DAY_DIR_RE = re.compile(r"^day(?P<day>\d+)$")
+PART_FILE_RE = re.compile(r"^part(?P<part>\d+)_")
+SOLVER_MODULE_RE = re.compile(rf"^day(?P<day>\d+)_(?P<part>{'|'.join(PARTS.values())})$")
+
+# Solver modules are only imported the first time they're requested, and
+# then kept around so repeated runs in the same process are cheap.
+_loaded_modules = {}
+
+
+def solver_module_name(day, part):
+    return f"day{day}_{PARTS[part]}"
+
+
+def solver_path(day, part):
+    return ROOT / f"day{day}" / "python" / f"{PARTS[part]}.py"
+
+
+def has_solver(day, part):
+    return part in PARTS and solver_path(day, part).is_file()
+
+
+def available_solvers():
+    """Yield (day, part) for every solver script present, in order."""
+    days = sorted(int(match.group("day"))
+                  for match in (DAY_DIR_RE.match(i.name) for i in ROOT.iterdir())
+                  if match is not None)
+    for day in days:
+        for part in PARTS:
+            if has_solver(day, part):
+                yield day, part
+
+
+def default_input(day, part):
+    """Return the puzzle input for a part.
+
+    Some days (e.g. day23) have a separate input for one part, stored as
+    `partN_input.txt` alongside the usual `input.txt`.
+    """
+    day_dir = ROOT / f"day{day}"
+    part_input = day_dir / f"part{part}_input.txt"
+    if part_input.is_file():
+        return part_input
+    return day_dir / "input.txt"
+
+
+def is_puzzle_input(path):
+    """True for real puzzle inputs, as opposed to sample inputs."""
+    return path.name == "input.txt" or path.name.endswith("_input.txt")
+
+
+def input_files(day, part):
+    """Return the puzzle input and any sample inputs for a part.
+
+    Files named `partN_*.txt` only apply to part N, so they're skipped
+    for the other part, and for part N they replace the generic file of
+    the same name (e.g. `part2_input.txt` replaces `input.txt`).
+    """
+    day_dir = ROOT / f"day{day}"
+    paths = sorted(day_dir.glob("*.txt"))
+    overridden = {path.name[len(f"part{part}_"):] for path in paths
+                  if path.name.startswith(f"part{part}_")}
+    files = []
+    for path in paths:
+        match = PART_FILE_RE.match(path.name)
+        if match is None:
+            if path.name not in overridden:
+                files.append(path)
+        elif int(match.group("part")) == part:
+            files.append(path)
+    return files
+
+
+def load_solver(day, part):
+    """Import the script for a day and part and return its `solve()`."""
+    key = (day, part)
+    module = _loaded_modules.get(key)
+    if module is None:
+        if not has_solver(day, part):
+            raise LookupError(f"no solver for day {day} part {part}")
+        spec = importlib.util.spec_from_file_location(
+            solver_module_name(day, part), solver_path(day, part))
+        module = importlib.util.module_from_spec(spec)
+        # Registered like any other module, so functions defined in a solver
+        # can be pickled and sent to worker processes.
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        _loaded_modules[key] = module
+    return module.solve
+
+
+def import_solver_module(name):
+    """Load the solver module called `name` (as named by load_solver()).
+
+    For use as a process pool initializer: workers started with spawn or
+    forkserver don't inherit the parent's solver modules, so functions from
+    them can't be unpickled there until this has run. Other names, such as
+    "__main__" (which multiprocessing deals with itself), are ignored.
+    """
+    match = SOLVER_MODULE_RE.match(name)
+    if match is not None:
+        part = next(part for part, part_name in PARTS.items() if part_name == match.group("part"))
+        load_solver(int(match.group("day")), part)
+
+
+def run_solver(day, part, input_path=None, **options):
+    """Run one solver against a file (default: the puzzle input).
+
+    Any `options` are passed on to its `solve()` as keyword arguments.
+    """
+    solve = load_solver(day, part)
+    if input_path is None:
+        input_path = default_input(day, part)
+    with open(input_path) as fd:
+        return solve(fd, **options)
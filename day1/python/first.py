@@ -1,7 +1,16 @@
 #!/usr/bin/env python3.10
 
 from itertools import pairwise
+from pathlib import Path
+import sys
 from sys import stdin
 
-print(sum(1 for prev, curr in pairwise(int(j.strip()) for j in stdin) if curr > prev))
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import ints
 
+def solve(stream):
+    return sum(1 for prev, curr in pairwise(ints(stream)) if curr > prev)
+
+if __name__ == "__main__":
+    print(solve(stdin))
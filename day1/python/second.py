@@ -1,16 +1,54 @@
 #!/usr/bin/env python3.10
 
-from itertools import pairwise
+from collections import deque
+from pathlib import Path
+import sys
 from sys import stdin
 
-# Lifted directly from itertools recipes
-def triplewise(iterable):
-    "Return overlapping triplets from an iterable"
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import int_token_chunks, iter_ints
 
-    # triplewise('ABCDEFG') -> ABC BCD CDE DEF EFG
-    for (a, _), (b, c) in pairwise(pairwise(iterable)):
-        yield a, b, c
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-triples = triplewise(int(i.strip()) for i in stdin)
-print(sum(1 for prev, curr in pairwise(triples) if sum(curr) > sum(prev)))
+# Consecutive windows of size k share k-1 values, so the sum goes up exactly
+# when the value entering the window is larger than the one leaving it:
+# a[i+1] + ... + a[i+k] > a[i] + ... + a[i+k-1] iff a[i+k] > a[i]. This
+# means no sums are needed at all, and only the last k values are kept.
 
+def ring_window_increases(values, k=3):
+    "Count window sum increases from an iterable of ints in O(k) memory"
+    window = deque(maxlen=k)
+    increases = 0
+    for value in values:
+        if len(window) == k and value > window[0]:
+            increases += 1
+        window.append(value)
+    return increases
+
+def numpy_window_increases(stream, k=3):
+    "As ring_window_increases() but vectorised a chunk of the input at a time"
+    carry = np.empty(0, dtype=np.int64)
+    increases = 0
+    for tokens in int_token_chunks(stream):
+        values = np.concatenate((carry, np.array(tokens).astype(np.int64)))
+        increases += int(np.count_nonzero(values[k:] > values[:-k]))
+        # The last k values are compared against the start of the next chunk.
+        carry = values[-k:]
+    return increases
+
+def window_increases(stream, k=3):
+    if k < 1:
+        raise ValueError("window size must be at least 1")
+    if np is not None:
+        return numpy_window_increases(stream, k)
+    return ring_window_increases(iter_ints(stream), k)
+
+def solve(stream):
+    return window_increases(stream, 3)
+
+if __name__ == "__main__":
+    print(solve(stdin))
@@ -1,18 +1,91 @@
 #!/usr/bin/env python3.10
 
+import argparse
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+import sys
 from sys import stdin
 
-BRACES = {"(": ")", "[": "]", "{": "}", "<": ">"}
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import line_chunks
+from advent.solvers import import_solver_module
+
+# Brackets are translated to integer codes up front: 0-3 for the openers
+# and 4-7 for the matching closers, so a closer matches the top of the
+# stack if it's exactly 4 more. The stack can't get deeper than the line is
+# long, so it's allocated once at that size and tracked with a depth.
+#
+# Lines don't depend on each other, so for really big logs the input is
+# cut into chunks of whole lines which can be farmed out to a process pool.
+
 POINTS = {")": 3, "]": 57, "}": 1197, ">": 25137}
+CODES = bytes.maketrans(b"([{<)]}>", bytes(range(8)))
+CHUNK_SIZE = 1 << 24
+
+CORRUPTED, INCOMPLETE, COMPLETE = "corrupted", "incomplete", "complete"
+
+def check_line(line):
+    """Classify a line of brackets, given as bytes.
+
+    Returns (CORRUPTED, first illegal character), (INCOMPLETE, score of the
+    characters needed to complete it) or (COMPLETE, None).
+    """
+    stack = [0] * len(line)
+    depth = 0
+    for position, code in enumerate(line.translate(CODES)):
+        if code < 4:
+            stack[depth] = code
+            depth += 1
+        elif depth and stack[depth - 1] == code - 4:
+            depth -= 1
+        else:
+            return CORRUPTED, chr(line[position])
+    if not depth:
+        return COMPLETE, None
+    score = 0
+    for code in reversed(stack[:depth]):
+        score = score * 5 + code + 1
+    return INCOMPLETE, score
+
+def scan_chunk(chunk):
+    points = 0
+    for status, value in map(check_line, chunk.split()):
+        if status == CORRUPTED:
+            points += POINTS[value]
+    return points
+
+def map_chunks(function, chunks, workers=1):
+    """Yield function(chunk) for each chunk in order, using `workers` processes.
+
+    Only a couple of chunks per worker are in flight at once, so the input
+    is never held in memory all at once. `workers` of None means one per CPU.
+    """
+    if workers == 1:
+        yield from map(function, chunks)
+        return
+    # Workers which don't start as a fork of this process need to load the
+    # solver module themselves before they can unpickle `function`.
+    with ProcessPoolExecutor(workers, initializer=import_solver_module,
+                             initargs=(function.__module__,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) > 2 * (workers or os.cpu_count()):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def solve(stream, workers=1, chunk_size=CHUNK_SIZE):
+    return sum(map_chunks(scan_chunk, line_chunks(stream, chunk_size), workers))
 
-points = 0
-for line in (i.strip() for i in stdin):
-    stack = deque()
-    for char in line:
-        if char in BRACES.keys():
-            stack.append(char)
-        elif char != BRACES[stack.pop()]:
-            points += POINTS[char]
-            break
-print(f"Points={points}")
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to check lines with (default: 1)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    print(f"Points={solve(stdin, args.workers)}")
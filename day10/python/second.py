@@ -1,22 +1,196 @@
 #!/usr/bin/env python3.10
 
+import argparse
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+import random
+import sys
 from sys import stdin
 
-BRACES = {"(": ")", "[": "]", "{": "}", "<": ">"}
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import line_chunks
+from advent.solvers import import_solver_module
+
+# Brackets are translated to integer codes up front: 0-3 for the openers
+# and 4-7 for the matching closers, so a closer matches the top of the
+# stack if it's exactly 4 more. The stack can't get deeper than the line is
+# long, so it's allocated once at that size and tracked with a depth.
+#
+# Lines don't depend on each other, so for really big logs the input is
+# cut into chunks of whole lines which can be farmed out to a process pool.
+# Only the median score is needed, which quickselect finds without sorting.
+
 POINTS = {")": 1, "]": 2, "}": 3, ">": 4}
+CODES = bytes.maketrans(b"([{<)]}>", bytes(range(8)))
+# Completion points indexed by the code of the opener being closed.
+COMPLETION_POINTS = [POINTS[i] for i in ")]}>"]
+CHUNK_SIZE = 1 << 24
+CHECKPOINT_INTERVAL = 64
+
+CORRUPTED, INCOMPLETE, COMPLETE = "corrupted", "incomplete", "complete"
+
+def check_line(line):
+    """Classify a line of brackets, given as bytes.
+
+    Returns (CORRUPTED, first illegal character), (INCOMPLETE, score of the
+    characters needed to complete it) or (COMPLETE, None).
+    """
+    stack = [0] * len(line)
+    depth = 0
+    for position, code in enumerate(line.translate(CODES)):
+        if code < 4:
+            stack[depth] = code
+            depth += 1
+        elif depth and stack[depth - 1] == code - 4:
+            depth -= 1
+        else:
+            return CORRUPTED, chr(line[position])
+    if not depth:
+        return COMPLETE, None
+    score = 0
+    for code in reversed(stack[:depth]):
+        score = score * 5 + COMPLETION_POINTS[code]
+    return INCOMPLETE, score
+
+def completion_score(codes):
+    "Return the completion score for a stack given as opener codes, top first"
+    # Each closer's points are a base 5 digit, and a long number converts
+    # far quicker by halves than one digit at a time.
+    if len(codes) <= 256:
+        score = 0
+        for code in codes:
+            score = score * 5 + COMPLETION_POINTS[code]
+        return score
+    half = len(codes) // 2
+    return completion_score(codes[:half]) * 5 ** (len(codes) - half) + completion_score(codes[half:])
+
+class EditableLine:
+    """A line of brackets which is re-checked cheaply as it's edited.
+
+    The stack is kept as a linked list of (code, rest of stack) pairs, which
+    are never changed once made, so a checkpoint of the stack every
+    `interval` characters is just a reference to one of them. Nothing before
+    an edit changes, so checking can carry on from the last checkpoint
+    before it rather than from the start. Edits after the first illegal
+    character can't change anything at all.
+
+    The completion score is as long as the stack is deep, so it's only
+    worked out when `result` is asked for.
+    """
+
+    def __init__(self, line, interval=CHECKPOINT_INTERVAL):
+        if interval < 1:
+            raise ValueError("checkpoint interval must be at least 1")
+        self.line = bytearray(line)
+        self.codes = self.line.translate(CODES)
+        self.interval = interval
+        self.checkpoints = [None]
+        self.corrupted_at = None
+        self.status = self._scan(0)
+
+    def _scan(self, checkpoint):
+        del self.checkpoints[checkpoint + 1:]
+        stack = self.checkpoints[checkpoint]
+        self.corrupted_at = None
+        self._result = None
+        codes = self.codes
+        interval = self.interval
+        for block in range(checkpoint * interval, len(codes), interval):
+            if block // interval == len(self.checkpoints):
+                self.checkpoints.append(stack)
+            for position in range(block, min(block + interval, len(codes))):
+                code = codes[position]
+                if code < 4:
+                    stack = (code, stack)
+                elif stack is not None and stack[0] == code - 4:
+                    stack = stack[1]
+                else:
+                    self.corrupted_at = position
+                    self.stack = None
+                    return CORRUPTED
+        self.stack = stack
+        return COMPLETE if stack is None else INCOMPLETE
+
+    @property
+    def result(self):
+        "The line's current result, as returned by check_line()"
+        if self._result is None:
+            if self.status == CORRUPTED:
+                self._result = CORRUPTED, chr(self.line[self.corrupted_at])
+            elif self.status == COMPLETE:
+                self._result = COMPLETE, None
+            else:
+                codes = bytearray()
+                stack = self.stack
+                while stack is not None:
+                    code, stack = stack
+                    codes.append(code)
+                self._result = INCOMPLETE, completion_score(codes)
+        return self._result
+
+    def edit(self, start, end, text):
+        "Replace line[start:end] with `text` (bytes) and return the new status"
+        if not 0 <= start <= end <= len(self.line):
+            raise IndexError("edit out of range")
+        self.line[start:end] = text
+        self.codes[start:end] = text.translate(CODES)
+        if self.corrupted_at is None or start <= self.corrupted_at:
+            self.status = self._scan(min(start // self.interval, len(self.checkpoints) - 1))
+        return self.status
+
+def scan_chunk(chunk):
+    return [value for status, value in map(check_line, chunk.split()) if status == INCOMPLETE]
+
+def map_chunks(function, chunks, workers=1):
+    """Yield function(chunk) for each chunk in order, using `workers` processes.
+
+    Only a couple of chunks per worker are in flight at once, so the input
+    is never held in memory all at once. `workers` of None means one per CPU.
+    """
+    if workers == 1:
+        yield from map(function, chunks)
+        return
+    # Workers which don't start as a fork of this process need to load the
+    # solver module themselves before they can unpickle `function`.
+    with ProcessPoolExecutor(workers, initializer=import_solver_module,
+                             initargs=(function.__module__,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) > 2 * (workers or os.cpu_count()):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def quickselect(values, k):
+    "Return the k-th smallest (zero-based) of a list of values in O(n) expected time"
+    while True:
+        pivot = random.choice(values)
+        lower = [i for i in values if i < pivot]
+        if k < len(lower):
+            values = lower
+            continue
+        k -= len(lower)
+        equal = sum(1 for i in values if i == pivot)
+        if k < equal:
+            return pivot
+        k -= equal
+        values = [i for i in values if i > pivot]
+
+def solve(stream, workers=1, chunk_size=CHUNK_SIZE):
+    points = []
+    for scores in map_chunks(scan_chunk, line_chunks(stream, chunk_size), workers):
+        points.extend(scores)
+    return quickselect(points, len(points) // 2)
 
-points = []
-for line in (i.strip() for i in stdin):
-    stack = deque()
-    for char in line:
-        if char in BRACES.keys():
-            stack.append(char)
-        elif char != BRACES[stack.pop()]:
-            break
-    else:
-        line_points = 0
-        for completer in (BRACES[i] for i in reversed(stack)):
-            line_points = line_points * 5 + POINTS[completer]
-        points.append(line_points)
-print(f"Median points={sorted(points)[len(points) // 2]}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to check lines with (default: 1)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    print(f"Median points={solve(stdin, args.workers)}")
@@ -1,54 +1,109 @@
 #!/usr/bin/env python3.10
 
+from pathlib import Path
+import sys
 from sys import stdin
 
-class EnergyMap:
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import digit_grid
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    def __init__(self, iterable):
-        self.rows = list(iterable)
+# The grid is kept as one flat list, and the indices of each square's
+# neighbours are worked out once up front, so the cascade is just list
+# indexing.
+#
+# With NumPy, the cascade instead goes in rounds across the whole grid:
+# every square at 10 or more that hasn't flashed yet flashes, and each
+# square goes up by the number of its neighbours which just flashed. That
+# count is a 3x3 sum over the flashes, done with shifted slices. The same
+# works for a whole stack of grids at once.
 
-    def _all_squares(self):
-        for y in range(len(self.rows)):
-            for x in range(len(self.rows[y])):
-                yield (x, y)
+def neighbour_table(width, height):
+    "Return the flat indices of the (up to 8) neighbours of each square"
+    table = []
+    for y in range(height):
+        for x in range(width):
+            table.append(tuple(ny * width + nx
+                               for ny in range(max(y - 1, 0), min(y + 2, height))
+                               for nx in range(max(x - 1, 0), min(x + 2, width))
+                               if (nx, ny) != (x, y)))
+    return table
 
-    def _neighbours(self, x, y):
-        for ny in range(y-1, y+2):
-            for nx in range(x-1, x+2):
-                if ((ny == y and nx == x)
-                    or not 0 <= ny < len(self.rows)
-                    or not 0 <= nx < len(self.rows[ny])):
-                    continue
-                yield (nx, ny)
+class EnergyMap:
+
+    def __init__(self, grid):
+        self.cells = list(grid.cells)
+        self.total_squares = len(self.cells)
+        self.neighbours = neighbour_table(grid.width, grid.height)
 
     def process_flashes(self):
-        to_flash = set()
         # Increment step and note initial flashers
-        for x, y in self._all_squares():
-            self.rows[y][x] += 1
-            if self.rows[y][x] == 10:
-                to_flash.add((x, y))
+        cells = self.cells = [i + 1 for i in self.cells]
+        to_flash = [square for square, energy in enumerate(cells) if energy == 10]
         # Repeatedly process flashers until none left
-        while True:
-            try:
-                flash_x, flash_y = to_flash.pop()
-                for x, y in self._neighbours(flash_x, flash_y):
-                    self.rows[y][x] += 1
-                    if self.rows[y][x] == 10:
-                        to_flash.add((x, y))
-            except KeyError:
-                break
+        neighbours = self.neighbours
+        while to_flash:
+            for square in neighbours[to_flash.pop()]:
+                cells[square] += 1
+                if cells[square] == 10:
+                    to_flash.append(square)
         # Reset all flashed to zero
         flashes = 0
-        for x, y in self._all_squares():
-            if self.rows[y][x] > 9:
-                self.rows[y][x] = 0
+        for square, energy in enumerate(cells):
+            if energy > 9:
+                cells[square] = 0
                 flashes += 1
-
         return flashes
 
-energy_map = EnergyMap([int(i) for i in line.strip()] for line in stdin)
-flashes = 0
-for i in range(100):
-    flashes += energy_map.process_flashes()
-print(f"Number of flashes={flashes}")
\ No newline at end of file
+def numpy_step(grids):
+    """Advance a (count, height, width) array of grids a step in place.
+
+    Returns the number of flashes in each grid.
+    """
+    grids += 1
+    flashed = grids > 9
+    new = flashed
+    # The 3x3 sums are done as a sum over 3 rows and then over 3 columns
+    # of that, on a copy padded with a border of zeros.
+    padded = np.zeros((grids.shape[0], grids.shape[1] + 2, grids.shape[2] + 2), dtype=grids.dtype)
+    while True:
+        # Only the grids which are still cascading need any work.
+        active = np.flatnonzero(new.any(axis=(1, 2)))
+        if not active.size:
+            break
+        block = padded[:len(active)]
+        block[:, 1:-1, 1:-1] = new[active]
+        rows = block[:, :-2] + block[:, 1:-1] + block[:, 2:]
+        grids[active] += rows[:, :, :-2] + rows[:, :, 1:-1] + rows[:, :, 2:] - new[active]
+        new = np.zeros_like(flashed)
+        new[active] = (grids[active] > 9) & ~flashed[active]
+        flashed |= new
+    grids[flashed] = 0
+    return flashed.sum(axis=(1, 2))
+
+def count_flashes(grids, steps=100):
+    """Return the total flashes over `steps` steps, for each grid.
+
+    `grids` is a (count, height, width) array, which is left as it was.
+    """
+    grids = np.array(grids, dtype=np.uint8)
+    flashes = np.zeros(len(grids), dtype=np.int64)
+    for step in range(steps):
+        flashes += numpy_step(grids)
+    return flashes
+
+def solve(stream):
+    # For a single small grid, plain lists beat NumPy's per-call overhead.
+    energy_map = EnergyMap(digit_grid(stream))
+    flashes = 0
+    for i in range(100):
+        flashes += energy_map.process_flashes()
+    return flashes
+
+if __name__ == "__main__":
+    print(f"Number of flashes={solve(stdin)}")
@@ -1,18 +1,21 @@
 #!/usr/bin/env python3.10
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import cache
 from string import ascii_uppercase
 from sys import stdin
 
 # Links are undirected, but we use a directed graph for convenient lookup.
-caves = defaultdict(set)
-for src, dst in ((s.strip(), d.strip()) for s, d in (line.split("-", 1) for line in stdin)):
-    caves[src].add(dst)
-    caves[dst].add(src)
+def read_caves(stream):
+    caves = defaultdict(set)
+    for src, dst in ((s.strip(), d.strip()) for s, d in (line.split("-", 1) for line in stream)):
+        caves[src].add(dst)
+        caves[dst].add(src)
+    return caves
 
 # Simple depth-first search via a generator which yields from itself.
 # For true recursion, we need to use immutable types (tuple and frozenset).
-def find_routes(src, dst, route=(), visited=frozenset(), small_cave_twice=False):
+def find_routes(caves, src, dst, route=(), visited=frozenset(), small_cave_twice=False):
     route += (src,)
     if src == dst:
         yield route
@@ -24,12 +27,71 @@ def find_routes(src, dst, route=(), visited=frozenset(), small_cave_twice=False)
             visited = visited.union((src,))
         for next_hop in (i for i in caves[src] if i not in visited):
             if alternative_visited is None:
-                yield from find_routes(next_hop, dst, route, visited, small_cave_twice)
+                yield from find_routes(caves, next_hop, dst, route, visited, small_cave_twice)
             else:
                 # If we haven't yet used our "visit twice" card on this route, we need to
                 # check the routes with and without visiting twice, and union them.
-                first_pass = frozenset(find_routes(next_hop, dst, route, visited, small_cave_twice))
-                second_pass = frozenset(find_routes(next_hop, dst, route, alternative_visited, True))
+                first_pass = frozenset(find_routes(caves, next_hop, dst, route, visited, small_cave_twice))
+                second_pass = frozenset(find_routes(caves, next_hop, dst, route, alternative_visited, True))
                 yield from second_pass.union(first_pass)
 
-print(f"Number of routes={sum(1 for i in find_routes('start', 'end'))}")
+# Large caves never run out, so all they do is give more ways to get from
+# one small cave to another. Replacing each of them with direct links
+# between every pair of small caves next to it (including from a small
+# cave back to itself) leaves a graph of just small caves, where each link
+# counts the number of ways of making that hop. Two large caves next to
+# each other could be bounced between forever, so those are rejected.
+def contract_large_caves(caves):
+    "Return {small cave: Counter of small caves reachable in one hop}"
+    small_caves = {}
+    for name, links in caves.items():
+        if name[0] in ascii_uppercase:
+            for other in links:
+                if other[0] in ascii_uppercase:
+                    raise ValueError(f"large caves {name} and {other} are linked, "
+                                     "so there are infinitely many routes")
+        else:
+            small_caves[name] = Counter(i for i in links if i[0] not in ascii_uppercase)
+    for name, links in caves.items():
+        if name[0] in ascii_uppercase:
+            for src in links:
+                small_caves[src].update(links)
+    return small_caves
+
+# Counting doesn't need the routes themselves. The number of ways
+# on to the end depends only on where we are, which small caves we've been
+# through and whether we've already been through one twice, so that's
+# memoised, with caves numbered so the visited small caves fit in a
+# bitmask. It's done on the contracted graph, where every cave is small and
+# each hop is weighted by the ways of making it. Going back into a visited
+# small cave is only allowed once, and never back to the start, which
+# counts each distinct route exactly once.
+def count_routes(caves, src, dst, small_cave_twice=False):
+    small_caves = contract_large_caves(caves)
+    names = sorted(small_caves)
+    ids = {name: cave_id for cave_id, name in enumerate(names)}
+    links = [tuple((ids[i], ways) for i, ways in small_caves[name].items()) for name in names]
+    src_id = ids[src]
+    dst_id = ids[dst]
+
+    @cache
+    def count_from(cave, visited, twice):
+        if cave == dst_id:
+            return 1
+        visited |= 1 << cave
+        total = 0
+        for next_hop, ways in links[cave]:
+            if not visited >> next_hop & 1:
+                total += ways * count_from(next_hop, visited, twice)
+            elif not twice and next_hop != src_id:
+                total += ways * count_from(next_hop, visited, True)
+        return total
+
+    return count_from(src_id, 0, small_cave_twice)
+
+def solve(stream):
+    caves = read_caves(stream)
+    return count_routes(caves, 'start', 'end')
+
+if __name__ == "__main__":
+    print(f"Number of routes={solve(stdin)}")
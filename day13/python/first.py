@@ -2,19 +2,21 @@
 
 from sys import stdin
 
-folds = []
-points = set()
-for line in (i.strip() for i in stdin):
-    if not line:
-        break
-    x, y = (int(i) for i in line.split(",", 1))
-    points.add((x, y))
-for line in (i.strip() for i in stdin):
-    items = line.split()
-    assert(items[0] == "fold")
-    assert(items[1] == "along")
-    coord, amount = items[2].split("=", 1)
-    folds.append((coord, int(amount)))
+def read_input(stream):
+    folds = []
+    points = set()
+    for line in (i.strip() for i in stream):
+        if not line:
+            break
+        x, y = (int(i) for i in line.split(",", 1))
+        points.add((x, y))
+    for line in (i.strip() for i in stream):
+        items = line.split()
+        assert(items[0] == "fold")
+        assert(items[1] == "along")
+        coord, amount = items[2].split("=", 1)
+        folds.append((coord, int(amount)))
+    return points, folds
 
 def fold_transform(points, fold):
     y_fold = (fold[0].lower() == "y")
@@ -26,5 +28,10 @@ def fold_transform(points, fold):
         else:
             yield (x, y)
 
-folded_points = set(fold_transform(points, folds[0]))
-print(f"Number of points after folds={len(folded_points)}")
+def solve(stream):
+    points, folds = read_input(stream)
+    folded_points = set(fold_transform(points, folds[0]))
+    return len(folded_points)
+
+if __name__ == "__main__":
+    print(f"Number of points after folds={solve(stdin)}")
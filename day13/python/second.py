@@ -1,41 +1,105 @@
 #!/usr/bin/env python3.10
 
-from itertools import count
 from sys import stdin
 
-folds = []
-points = set()
-for line in (i.strip() for i in stdin):
-    if not line:
-        break
-    x, y = (int(i) for i in line.split(",", 1))
-    points.add((x, y))
-for line in (i.strip() for i in stdin):
-    items = line.split()
-    assert(items[0] == "fold")
-    assert(items[1] == "along")
-    coord, amount = items[2].split("=", 1)
-    folds.append((coord, int(amount)))
-
-def fold_transform(points, fold):
-    y_fold = (fold[0].lower() == "y")
-    offset = fold[1]
-    for x, y in points:
-        if (y_fold and y > offset) or (not y_fold and x > offset):
-            yield (x if y_fold else 2 * offset - x,
-                   y if not y_fold else 2 * offset - y)
-        else:
-            yield (x, y)
-
-folded_points = points
-for fold in folds:
-    folded_points = fold_transform(folded_points, fold)
-folded_points = set(folded_points)
-
-max_x = max(x for x, y in folded_points)
-max_y = max(y for x, y in folded_points)
-for row in range(max_y + 1):
-    line = [" "] * (max_x + 1)
-    for x, y in ((x, y) for x, y in folded_points if y == row):
-        line[x] = "*"
-    print("".join(line))
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def read_input(stream):
+    folds = []
+    points = set()
+    for line in (i.strip() for i in stream):
+        if not line:
+            break
+        x, y = (int(i) for i in line.split(",", 1))
+        points.add((x, y))
+    for line in (i.strip() for i in stream):
+        items = line.split()
+        assert(items[0] == "fold")
+        assert(items[1] == "along")
+        coord, amount = items[2].split("=", 1)
+        folds.append((coord, int(amount)))
+    return points, folds
+
+# Folds along x only ever move x coordinates, and folds along y only y,
+# so each axis can be handled on its own. All the folds along an axis
+# together just map each coordinate to a new one, which is worked out once
+# for every coordinate up to the largest as a lookup table. Each fold
+# leaves the coordinates in a smaller range, so the folds are composed last
+# first, with each one's table only covering the range the folds before it
+# leave, and only the first fold's covers every coordinate. Then each point
+# only needs one lookup per axis, however many folds there are. Points
+# which land on each other are merged by packing them into ints, which
+# also gives their position in a flat bitmap of the paper.
+
+def fold_ranges(size, offsets):
+    "Return the range of coordinates (low, high) left after each fold in turn"
+    ranges = [(0, size - 1)]
+    for offset in offsets:
+        low, high = ranges[-1]
+        ranges.append((min(low, 2 * offset - high), min(high, offset)))
+    return ranges
+
+def fold_table(size, offsets):
+    "Return where each coordinate below `size` ends up after folding at each offset in turn"
+    ranges = fold_ranges(size, offsets)
+    low, high = ranges.pop()
+    table = list(range(low, high + 1))
+    for offset in reversed(offsets):
+        base = low
+        low, high = ranges.pop()
+        table = [table[(2 * offset - i if i > offset else i) - base] for i in range(low, high + 1)]
+    return table
+
+def numpy_fold_table(size, offsets):
+    ranges = fold_ranges(size, offsets)
+    low, high = ranges.pop()
+    table = np.arange(low, high + 1)
+    for offset in reversed(offsets):
+        base = low
+        low, high = ranges.pop()
+        coords = np.arange(low, high + 1)
+        table = table[np.where(coords > offset, 2 * offset - coords, coords) - base]
+    return table
+
+def render_rows(rows):
+    return "\n".join(rows)
+
+def render(points, x_offsets, y_offsets):
+    x_table = fold_table(max(x for x, y in points) + 1, x_offsets)
+    y_table = fold_table(max(y for x, y in points) + 1, y_offsets)
+    xs = [x_table[x] for x, y in points]
+    ys = [y_table[y] for x, y in points]
+    # Folds can push points below zero, so shift everything to be positive.
+    min_x = min(0, min(xs))
+    min_y = min(0, min(ys))
+    width = max(xs) - min_x + 1
+    keys = {(y - min_y) * width + x - min_x for x, y in zip(xs, ys)}
+    paper = [" "] * (max(keys) // width + 1) * width
+    for key in keys:
+        paper[key] = "*"
+    return render_rows("".join(paper[i:i + width]) for i in range(0, len(paper), width))
+
+def numpy_render(points, x_offsets, y_offsets):
+    xs, ys = np.array(list(points)).T
+    xs = numpy_fold_table(xs.max() + 1, x_offsets)[xs]
+    ys = numpy_fold_table(ys.max() + 1, y_offsets)[ys]
+    xs -= min(0, xs.min())
+    ys -= min(0, ys.min())
+    paper = np.zeros((ys.max() + 1, xs.max() + 1), dtype=bool)
+    paper[ys, xs] = True
+    return render_rows(row.tobytes().decode()
+                       for row in np.where(paper, np.uint8(ord("*")), np.uint8(ord(" "))))
+
+def solve(stream):
+    points, folds = read_input(stream)
+    x_offsets = [amount for axis, amount in folds if axis.lower() == "x"]
+    y_offsets = [amount for axis, amount in folds if axis.lower() == "y"]
+    if np is not None:
+        return numpy_render(points, x_offsets, y_offsets)
+    return render(points, x_offsets, y_offsets)
+
+if __name__ == "__main__":
+    print(solve(stdin))
@@ -4,23 +4,129 @@ from collections import Counter
 from itertools import pairwise
 from sys import stdin
 
-def process_insertions(formula, transforms):
-    for first, second in pairwise(formula):
-        yield first
-        replacement = transforms.get((first, second))
-        if replacement is not None:
-            yield replacement
-    yield second
-
-formula = list(stdin.readline().strip())
-transforms = {}
-for line in (i.strip() for i in stdin):
-    if line:
-        src, dst = (i.strip() for i in line.split("->", 1))
-        transforms[tuple(src)] = dst
-
-for step in range(10):
-    formula = list(process_insertions(formula, transforms))
-
-counts = Counter(formula).most_common()
-print(f"Most minus least common={counts[0][1]-counts[-1][1]}")
+# Only the frequencies are needed, and every pair in the polymer grows
+# independently of the others, so we just track how many of each pair
+# there are. Every letter bar the last one is the first letter of exactly
+# one pair, and the last letter never changes, which gives the letter
+# counts back from the pair counts. A pair with a letter that's in no rule
+# can never change, so it's left out of the vector and its first letter is
+# just counted once.
+#
+# A step is then a linear map on the vector of pair counts, i.e. a matrix,
+# and N steps is its Nth power, which squaring gets in O(log N) products.
+# The squares depend only on the rules, so they're kept and reused for
+# every template and step count. For short runs, applying the rules step by
+# step is still quicker, since each step only costs as much as the pairs.
+# Counts double each step, so very long runs want a modulus.
+
+STEPS = 10
+
+class PairRules:
+
+    def __init__(self, transforms):
+        self.letters = sorted({i for pair, new in transforms.items() for i in (*pair, new)})
+        self.index = {letter: i for i, letter in enumerate(self.letters)}
+        # The pairs each pair becomes in one step, by index.
+        self.successors = []
+        for first in self.letters:
+            for second in self.letters:
+                new = transforms.get((first, second))
+                if new is None:
+                    self.successors.append((self.pair_index(first, second),))
+                else:
+                    self.successors.append((self.pair_index(first, new),
+                                            self.pair_index(new, second)))
+        # Powers M^(2^k) of the transition matrix, per modulus.
+        self.squares = {}
+
+    def pair_index(self, first, second):
+        try:
+            return self.index[first] * len(self.letters) + self.index[second]
+        except KeyError as exc:
+            raise ValueError(f"{exc.args[0]} doesn't appear in any rule") from None
+
+    def is_inert(self, first, second):
+        "True for a pair which no rule can ever change"
+        return first not in self.index or second not in self.index
+
+    def pair_vector(self, template):
+        "Return the counts of each of the template's pairs by index, bar inert ones"
+        vector = [0] * len(self.successors)
+        for first, second in pairwise(template):
+            if not self.is_inert(first, second):
+                vector[self.pair_index(first, second)] += 1
+        return vector
+
+    def step(self, vector, modulus=None):
+        result = [0] * len(vector)
+        for pair, count in enumerate(vector):
+            if count:
+                for successor in self.successors[pair]:
+                    result[successor] += count
+        if modulus is not None:
+            result = [i % modulus for i in result]
+        return result
+
+    def square(self, k, modulus=None):
+        "Return the transition matrix raised to the power 2^k, as a list of rows"
+        squares = self.squares.setdefault(modulus, [])
+        if not squares:
+            size = len(self.successors)
+            matrix = [[0] * size for i in range(size)]
+            for pair, successors in enumerate(self.successors):
+                for successor in successors:
+                    matrix[successor][pair] += 1
+            squares.append(matrix)
+        while len(squares) <= k:
+            matrix = squares[-1]
+            columns = list(zip(*matrix))
+            matrix = [[sum(map(int.__mul__, row, column)) for column in columns] for row in matrix]
+            if modulus is not None:
+                matrix = [[i % modulus for i in row] for row in matrix]
+            squares.append(matrix)
+        return squares[k]
+
+    def advance(self, vector, steps, modulus=None):
+        "Return the pair counts `steps` steps on from `vector`"
+        # Stepping costs len(vector) per step, and a matrix product costs
+        # len(vector)^3, so that's the break-even point.
+        if steps < len(vector) ** 2 and not self.squares.get(modulus):
+            for step in range(steps):
+                vector = self.step(vector, modulus)
+            return vector
+        k = 0
+        while steps:
+            if steps & 1:
+                vector = [sum(map(int.__mul__, row, vector)) for row in self.square(k, modulus)]
+                if modulus is not None:
+                    vector = [i % modulus for i in vector]
+            steps >>= 1
+            k += 1
+        return vector
+
+    def element_counts(self, template, steps, modulus=None):
+        "Return a Counter of each letter's frequency after `steps` steps"
+        counts = Counter({template[-1]: 1})
+        counts.update(first for first, second in pairwise(template) if self.is_inert(first, second))
+        vector = self.advance(self.pair_vector(template), steps, modulus)
+        size = len(self.letters)
+        for pair, count in enumerate(vector):
+            if count:
+                counts[self.letters[pair // size]] += count
+        if modulus is not None:
+            counts = Counter({letter: count % modulus for letter, count in counts.items()})
+        return counts
+
+def solve(stream):
+    template = stream.readline().strip()
+    transforms = {}
+    for line in (i.strip() for i in stream):
+        if line:
+            src, dst = (i.strip() for i in line.split("->", 1))
+            transforms[tuple(src)] = dst
+
+    counts = PairRules(transforms).element_counts(template, STEPS).most_common()
+    return counts[0][1] - counts[-1][1]
+
+if __name__ == "__main__":
+    print(f"Most minus least common={solve(stdin)}")
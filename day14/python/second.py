@@ -4,78 +4,129 @@ from collections import Counter
 from itertools import pairwise
 from sys import stdin
 
-# With the larger number of iterations, the naive approach of tracking
-# the polymer formula doesn't scale (gets too large too quickly). Since
-# we only need the frequencies, however, and since the items added are
-# independent, we can just track pair counts and derive the frequencies.
-# To do this correctly needs the two ends being tracked specially, as
-# these are the only cases where both items of the pair aren't shared
-# with another.
+# Only the frequencies are needed, and every pair in the polymer grows
+# independently of the others, so we just track how many of each pair
+# there are. Every letter bar the last one is the first letter of exactly
+# one pair, and the last letter never changes, which gives the letter
+# counts back from the pair counts. A pair with a letter that's in no rule
+# can never change, so it's left out of the vector and its first letter is
+# just counted once.
+#
+# A step is then a linear map on the vector of pair counts, i.e. a matrix,
+# and N steps is its Nth power, which squaring gets in O(log N) products.
+# The squares depend only on the rules, so they're kept and reused for
+# every template and step count. For short runs, applying the rules step by
+# step is still quicker, since each step only costs as much as the pairs.
+# Counts double each step, so very long runs want a modulus.
 
-class Formula:
-    """Store formula as count of pairs.
+STEPS = 40
 
-    The first and last pair are stored in attributes `first` and `last`.
-    Remaining (overlapping) pairs are stored in a Counter. As an example,
-    the formula 'ABCBCD' would resolve into:
-    - first = ('A', 'B')
-    - last = ('C', 'D')
-    - rest = Counter({('B', 'C'): 2, ('C', 'B'): 1})
-    """
+class PairRules:
 
-    def __init__(self, formula_str, transforms):
-        self.first = formula_str[0], formula_str[1]
-        self.rest = Counter(pairwise(formula_str[1:-1]))
-        self.last = formula_str[-2], formula_str[-1]
-        self.transforms = transforms
+    def __init__(self, transforms):
+        self.letters = sorted({i for pair, new in transforms.items() for i in (*pair, new)})
+        self.index = {letter: i for i, letter in enumerate(self.letters)}
+        # The pairs each pair becomes in one step, by index.
+        self.successors = []
+        for first in self.letters:
+            for second in self.letters:
+                new = transforms.get((first, second))
+                if new is None:
+                    self.successors.append((self.pair_index(first, second),))
+                else:
+                    self.successors.append((self.pair_index(first, new),
+                                            self.pair_index(new, second)))
+        # Powers M^(2^k) of the transition matrix, per modulus.
+        self.squares = {}
 
-    def iterate(self):
-        """Transform first & last, then rest.
+    def pair_index(self, first, second):
+        try:
+            return self.index[first] * len(self.letters) + self.index[second]
+        except KeyError as exc:
+            raise ValueError(f"{exc.args[0]} doesn't appear in any rule") from None
 
-        If the first and last transform, the additional character
-        will push the old one into rest. We do all updates with a delta
-        counter before applying, because each transformation in the
-        row is meant to happen simultaneously with each other.
-        """
-        delta = Counter()
-        # Handle first pair
-        addition = transforms.get(self.first)
-        if addition is not None:
-            delta[(addition, self.first[1])] += 1
-            self.first = (self.first[0], addition)
-        # Handle last pair
-        addition = transforms.get(self.last)
-        if addition is not None:
-            delta[(self.last[0], addition)] += 1
-            self.last = (addition, self.last[1])
-        # Handle remaining inner pairs
-        for (first, second), count in self.rest.items():
-            replacement = transforms.get((first, second))
-            if replacement is not None:
-                delta[(first, replacement)] += count
-                delta[(replacement, second)] += count
-                delta[(first, second)] -= count
-        self.rest += delta
+    def is_inert(self, first, second):
+        "True for a pair which no rule can ever change"
+        return first not in self.index or second not in self.index
 
-    def get_counts(self):
-        counts = Counter()
-        for (first, unused_second), count in self.rest.items():
-            counts[first] += count
-        counts[self.first[0]] += 1
-        counts[self.last[0]] += 1
-        counts[self.last[1]] += 1
+    def pair_vector(self, template):
+        "Return the counts of each of the template's pairs by index, bar inert ones"
+        vector = [0] * len(self.successors)
+        for first, second in pairwise(template):
+            if not self.is_inert(first, second):
+                vector[self.pair_index(first, second)] += 1
+        return vector
+
+    def step(self, vector, modulus=None):
+        result = [0] * len(vector)
+        for pair, count in enumerate(vector):
+            if count:
+                for successor in self.successors[pair]:
+                    result[successor] += count
+        if modulus is not None:
+            result = [i % modulus for i in result]
+        return result
+
+    def square(self, k, modulus=None):
+        "Return the transition matrix raised to the power 2^k, as a list of rows"
+        squares = self.squares.setdefault(modulus, [])
+        if not squares:
+            size = len(self.successors)
+            matrix = [[0] * size for i in range(size)]
+            for pair, successors in enumerate(self.successors):
+                for successor in successors:
+                    matrix[successor][pair] += 1
+            squares.append(matrix)
+        while len(squares) <= k:
+            matrix = squares[-1]
+            columns = list(zip(*matrix))
+            matrix = [[sum(map(int.__mul__, row, column)) for column in columns] for row in matrix]
+            if modulus is not None:
+                matrix = [[i % modulus for i in row] for row in matrix]
+            squares.append(matrix)
+        return squares[k]
+
+    def advance(self, vector, steps, modulus=None):
+        "Return the pair counts `steps` steps on from `vector`"
+        # Stepping costs len(vector) per step, and a matrix product costs
+        # len(vector)^3, so that's the break-even point.
+        if steps < len(vector) ** 2 and not self.squares.get(modulus):
+            for step in range(steps):
+                vector = self.step(vector, modulus)
+            return vector
+        k = 0
+        while steps:
+            if steps & 1:
+                vector = [sum(map(int.__mul__, row, vector)) for row in self.square(k, modulus)]
+                if modulus is not None:
+                    vector = [i % modulus for i in vector]
+            steps >>= 1
+            k += 1
+        return vector
+
+    def element_counts(self, template, steps, modulus=None):
+        "Return a Counter of each letter's frequency after `steps` steps"
+        counts = Counter({template[-1]: 1})
+        counts.update(first for first, second in pairwise(template) if self.is_inert(first, second))
+        vector = self.advance(self.pair_vector(template), steps, modulus)
+        size = len(self.letters)
+        for pair, count in enumerate(vector):
+            if count:
+                counts[self.letters[pair // size]] += count
+        if modulus is not None:
+            counts = Counter({letter: count % modulus for letter, count in counts.items()})
         return counts
 
-formula_str = stdin.readline().strip()
-transforms = {}
-for line in (i.strip() for i in stdin):
-    if line:
-        src, dst = (i.strip() for i in line.split("->", 1))
-        transforms[tuple(src)] = dst
+def solve(stream):
+    template = stream.readline().strip()
+    transforms = {}
+    for line in (i.strip() for i in stream):
+        if line:
+            src, dst = (i.strip() for i in line.split("->", 1))
+            transforms[tuple(src)] = dst
 
-formula = Formula(formula_str, transforms)
-for step in range(40):
-    formula.iterate()
+    counts = PairRules(transforms).element_counts(template, STEPS).most_common()
+    return counts[0][1] - counts[-1][1]
 
-counts = formula.get_counts().most_common()
-print(f"Most minus least common={counts[0][1]-counts[-1][1]}")
+if __name__ == "__main__":
+    print(f"Most minus least common={solve(stdin)}")
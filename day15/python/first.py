@@ -2,8 +2,14 @@
 
 from collections import defaultdict
 import heapq
+from pathlib import Path
+import sys
 from sys import stdin, stdout
 
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import digit_grid
+
 class Grid:
     def __init__(self, rows):
         self.rows = list(rows)
@@ -51,7 +57,11 @@ class Grid:
 
         return entries[dst][0]
 
-grid = Grid(list(int(i) for i in line) for line in (j.strip() for j in stdin))
-src = (0, 0)
-dst = (len(grid.rows[len(grid.rows)-1]) - 1, len(grid.rows) - 1)
-print(f"Shortest distance={grid.min_route(src, dst)}")
+def solve(stream):
+    grid = Grid(digit_grid(stream).rows())
+    src = (0, 0)
+    dst = (len(grid.rows[len(grid.rows)-1]) - 1, len(grid.rows) - 1)
+    return grid.min_route(src, dst)
+
+if __name__ == "__main__":
+    print(f"Shortest distance={solve(stdin)}")
@@ -2,8 +2,14 @@
 
 from collections import defaultdict
 import heapq
+from pathlib import Path
+import sys
 from sys import stdin, stdout
 
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import digit_grid
+
 class Grid:
     def __init__(self, rows):
         self.rows = list(rows)
@@ -51,16 +57,21 @@ class Grid:
 
         return entries[dst][0]
 
-rows = [list(int(i) for i in line) for line in (j.strip() for j in stdin)]
-# Replicate horizontally
-rows = [[(elem+i-1) % 9 + 1 for i in range(5) for elem in row] for row in rows]
-# Replicate vertically
-num_rows = len(rows)
-for i in range(1, 5):
-    for j in range(num_rows):
-        rows.append([(elem+i-1) % 9 + 1 for elem in rows[j]])
+def solve(stream):
+    rows = digit_grid(stream).rows()
+    # Replicate horizontally
+    rows = [[(elem+i-1) % 9 + 1 for i in range(5) for elem in row] for row in rows]
+    # Replicate vertically
+    num_rows = len(rows)
+    for i in range(1, 5):
+        for j in range(num_rows):
+            rows.append([(elem+i-1) % 9 + 1 for elem in rows[j]])
+
+    grid = Grid(rows)
+    src = (0, 0)
+    dst = (len(grid.rows[len(grid.rows)-1]) - 1, len(grid.rows) - 1)
+    return grid.min_route(src, dst)
+
+if __name__ == "__main__":
+    print(f"Shortest distance={solve(stdin)}")
 
-grid = Grid(rows)
-src = (0, 0)
-dst = (len(grid.rows[len(grid.rows)-1]) - 1, len(grid.rows) - 1)
-print(f"Shortest distance={grid.min_route(src, dst)}")
@@ -88,5 +88,9 @@ def yield_versions(packets):
         if isinstance(packet, OperatorPacket):
             yield from yield_versions(iter(packet.sub_packets))
 
-versions = yield_versions(yield_packets(BinaryReader(hexstr=stdin.readline().strip())))
-print(f"Total versions={sum(versions)}")
+def solve(stream):
+    versions = yield_versions(yield_packets(BinaryReader(hexstr=stream.readline().strip())))
+    return sum(versions)
+
+if __name__ == "__main__":
+    print(f"Total versions={solve(stdin)}")
@@ -100,5 +100,9 @@ def yield_packets(reader):
     except BinaryReaderExhaustedError:
         pass
 
-version, packet = decode_packet(BinaryReader(hexstr=stdin.readline().strip()))
-print(f"Expression value={packet.get_value()}")
+def solve(stream):
+    version, packet = decode_packet(BinaryReader(hexstr=stream.readline().strip()))
+    return packet.get_value()
+
+if __name__ == "__main__":
+    print(f"Expression value={solve(stdin)}")
@@ -8,10 +8,6 @@ from sys import stdin
 TARGET_AREA_RE = re.compile("^\s*target area:\s*x=(?P<minx>-?\d+)\.+(?P<maxx>-?\d+)"
                             ",\s*y=(?P<miny>-?\d+)\.+(?P<maxy>-?\d+)\s*$")
 
-target_area_match = TARGET_AREA_RE.match(stdin.readline())
-target_x = (int(target_area_match.group("minx")), int(target_area_match.group("maxx")))
-target_y = (int(target_area_match.group("miny")), int(target_area_match.group("maxy")))
-
 # Brute force is sufficient for this problem.
 
 def check_target(x_vel, y_vel, target_x, target_y):
@@ -27,12 +23,31 @@ def check_target(x_vel, y_vel, target_x, target_y):
         y_vel -= 1
     return False
 
-possible_vels = set()
-for init_x_vel in range(1, 200):
-    for init_y_vel in range(200):
-        if check_target(init_x_vel, init_y_vel, target_x, target_y):
-            possible_vels.add((init_x_vel, init_y_vel))
+def read_target(stream):
+    target_area_match = TARGET_AREA_RE.match(stream.readline())
+    target_x = (int(target_area_match.group("minx")), int(target_area_match.group("maxx")))
+    target_y = (int(target_area_match.group("miny")), int(target_area_match.group("maxy")))
+    return target_x, target_y
+
+def highest_launch(stream):
+    "Return the (y_vel, x_vel) which goes highest while still hitting the target"
+    target_x, target_y = read_target(stream)
+    possible_vels = set()
+    for init_x_vel in range(1, 200):
+        for init_y_vel in range(200):
+            if check_target(init_x_vel, init_y_vel, target_x, target_y):
+                possible_vels.add((init_x_vel, init_y_vel))
+
+    y_vel, x_vel = max(possible_vels, key=lambda x: x[1])
+    return y_vel, x_vel
+
+def max_height(y_vel):
+    return (y_vel * (y_vel + 1)) // 2
+
+def solve(stream):
+    y_vel, x_vel = highest_launch(stream)
+    return max_height(y_vel)
 
-y_vel, x_vel = max(possible_vels, key=lambda x: x[1])
-max_height = (y_vel * (y_vel + 1)) // 2
-print(f"Max height={max_height} y_vel={y_vel} x_vel={x_vel}")
\ No newline at end of file
+if __name__ == "__main__":
+    y_vel, x_vel = highest_launch(stdin)
+    print(f"Max height={max_height(y_vel)} y_vel={y_vel} x_vel={x_vel}")
@@ -150,8 +150,11 @@ class SnailfishNumber:
         current.value += to_add
 
 
-result = SnailfishNumber(stdin.readline().strip())
-for line in (i.strip() for i in stdin):
-    result.add(SnailfishNumber(line))
-print(str(result.root))
-print(f"Magnitude={result.root.magnitude()}")
+def solve(stream):
+    result = SnailfishNumber(stream.readline().strip())
+    for line in (i.strip() for i in stream):
+        result.add(SnailfishNumber(line))
+    return result.root.magnitude()
+
+if __name__ == "__main__":
+    print(f"Magnitude={solve(stdin)}")
@@ -149,10 +149,14 @@ class SnailfishNumber:
             current = current.left
         current.value += to_add
 
-magnitudes = set()
-specs = set(i.strip() for i in stdin)
-for first, second in permutations(specs, 2):
-    first = SnailfishNumber(first)
-    first.add(SnailfishNumber(second))
-    magnitudes.add(first.root.magnitude())
-print(f"Max magnitude={max(magnitudes)}")
+def solve(stream):
+    magnitudes = set()
+    specs = set(i.strip() for i in stream)
+    for first, second in permutations(specs, 2):
+        first = SnailfishNumber(first)
+        first.add(SnailfishNumber(second))
+        magnitudes.add(first.root.magnitude())
+    return max(magnitudes)
+
+if __name__ == "__main__":
+    print(f"Max magnitude={solve(stdin)}")
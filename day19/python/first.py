@@ -2,7 +2,7 @@
 
 from collections import defaultdict
 from math import radians, sin, cos
-from sys import stdin
+from sys import stderr, stdin
 
 class Vector(tuple):
 
@@ -77,9 +77,7 @@ ORIENTATIONS = (
     RX(180) * RY(270), RX(90) * RY(270), RY(270), RX(270) * RY(270)
 )
 
-transform_cache = dict()
-
-def process_scanner(scanner, base_beacons, new_beacons):
+def process_scanner(scanner, base_beacons, new_beacons, transform_cache):
     # We try the matching process at each orientation until we hit a match.
     for transform_id, transform in enumerate(ORIENTATIONS):
         # First we apply the current rotation to all new beacons.
@@ -94,45 +92,51 @@ def process_scanner(scanner, base_beacons, new_beacons):
                 # beacons and see how many matches we get.
                 delta = known_beacon - to_check
                 translated = set(vec + delta for vec in transformed_new)
-                if len(translated & known_beacons) >= 12:
+                if len(translated & base_beacons) >= 12:
                     # We have found a match!
                     return translated
     # No match.
     return None
 
-base_scanner = current_scanner = None
-scanners = defaultdict(set)
-for line in (i.strip() for i in stdin):
-    if not line:
-        continue
-    elif line.startswith("--"):
-        current_scanner = line.strip("-").strip()
-        if base_scanner is None:
-            base_scanner = current_scanner
-    else:
-        scanners[current_scanner].add(Vector(int(i) for i in line.split(",")))
-
-found_scanners = {base_scanner: scanners[base_scanner]}
-
-done_pairs = set()
-while len(found_scanners) < len(scanners):
-    progress = False
-    for new_scanner, new_beacons in scanners.items():
-        if new_scanner in found_scanners:
+def solve(stream):
+    base_scanner = current_scanner = None
+    scanners = defaultdict(set)
+    for line in (i.strip() for i in stream):
+        if not line:
             continue
-        for known_scanner, known_beacons in found_scanners.items():
-            pair = (new_scanner, known_scanner)
-            if pair in done_pairs:
+        elif line.startswith("--"):
+            current_scanner = line.strip("-").strip()
+            if base_scanner is None:
+                base_scanner = current_scanner
+        else:
+            scanners[current_scanner].add(Vector(int(i) for i in line.split(",")))
+
+    found_scanners = {base_scanner: scanners[base_scanner]}
+    transform_cache = dict()
+
+    done_pairs = set()
+    while len(found_scanners) < len(scanners):
+        progress = False
+        for new_scanner, new_beacons in scanners.items():
+            if new_scanner in found_scanners:
                 continue
-            done_pairs.add(pair)
-            result = process_scanner(new_scanner, known_beacons, new_beacons)
-            if result is not None:
-                found_scanners[new_scanner] = result
-                progress = True
-                print(f"Matched {new_scanner} with {known_scanner} ({len(found_scanners)} of {len(scanners)})")
-                break
-    if not progress:
-        raise Exception("failed to match all scanners")
-
-all_beacons = set().union(*(found_scanners.values()))
-print(f"Beacons={len(all_beacons)}")
+            for known_scanner, known_beacons in found_scanners.items():
+                pair = (new_scanner, known_scanner)
+                if pair in done_pairs:
+                    continue
+                done_pairs.add(pair)
+                result = process_scanner(new_scanner, known_beacons, new_beacons, transform_cache)
+                if result is not None:
+                    found_scanners[new_scanner] = result
+                    progress = True
+                    print(f"Matched {new_scanner} with {known_scanner} ({len(found_scanners)} of {len(scanners)})",
+                          file=stderr)
+                    break
+        if not progress:
+            raise Exception("failed to match all scanners")
+
+    all_beacons = set().union(*(found_scanners.values()))
+    return len(all_beacons)
+
+if __name__ == "__main__":
+    print(f"Beacons={solve(stdin)}")
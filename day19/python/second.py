@@ -2,7 +2,7 @@
 
 from collections import defaultdict
 from math import radians, sin, cos
-from sys import stdin
+from sys import stderr, stdin
 
 class Vector(tuple):
 
@@ -82,9 +82,7 @@ ORIENTATIONS = (
     RX(180) * RY(270), RX(90) * RY(270), RY(270), RX(270) * RY(270)
 )
 
-transform_cache = dict()
-
-def process_scanner(scanner, base_beacons, new_beacons):
+def process_scanner(scanner, base_beacons, new_beacons, transform_cache):
     # We try the matching process at each orientation until we hit a match.
     for transform_id, transform in enumerate(ORIENTATIONS):
         # First we apply the current rotation to all new beacons.
@@ -99,57 +97,59 @@ def process_scanner(scanner, base_beacons, new_beacons):
                 # beacons and see how many matches we get.
                 delta = known_beacon - to_check
                 translated = set(vec + delta for vec in transformed_new)
-                if len(translated & known_beacons) >= 12:
+                if len(translated & base_beacons) >= 12:
                     # We have found a match!
                     return (translated, delta)
     # No match.
     return None
 
-base_scanner = current_scanner = None
-scanners = defaultdict(set)
-for line in (i.strip() for i in stdin):
-    if not line:
-        continue
-    elif line.startswith("--"):
-        current_scanner = line.strip("-").strip()
-        if base_scanner is None:
-            base_scanner = current_scanner
-    else:
-        scanners[current_scanner].add(Vector(int(i) for i in line.split(",")))
-
-found_scanners = {base_scanner: scanners[base_scanner]}
-scanner_positions = {base_scanner: Vector((0,0,0))}
-
-done_pairs = set()
-while len(found_scanners) < len(scanners):
-    progress = False
-    for new_scanner, new_beacons in scanners.items():
-        if new_scanner in found_scanners:
-            continue
-        for known_scanner, known_beacons in found_scanners.items():
-            pair = (new_scanner, known_scanner)
-            if pair in done_pairs:
-                continue
-            done_pairs.add(pair)
-            result = process_scanner(new_scanner, known_beacons, new_beacons)
-            if result is not None:
-                found_scanners[new_scanner] = result[0]
-                scanner_positions[new_scanner] = result[1]
-                progress = True
-                print(f"Matched {new_scanner} with {known_scanner} ({len(found_scanners)} of {len(scanners)})")
-                break
-    if not progress:
-        raise Exception("failed to match all scanners")
-
-print(scanner_positions)
-
-
 def m_dist(first, second):
     return sum(abs(first[i] - second[i]) for i in range(3))
 
-max_dist = 0
-for first in scanner_positions.values():
-    for second in scanner_positions.values():
-        max_dist = max(max_dist, m_dist(first, second))
+def solve(stream):
+    base_scanner = current_scanner = None
+    scanners = defaultdict(set)
+    for line in (i.strip() for i in stream):
+        if not line:
+            continue
+        elif line.startswith("--"):
+            current_scanner = line.strip("-").strip()
+            if base_scanner is None:
+                base_scanner = current_scanner
+        else:
+            scanners[current_scanner].add(Vector(int(i) for i in line.split(",")))
 
-print(f"Max distance={max_dist}")
\ No newline at end of file
+    found_scanners = {base_scanner: scanners[base_scanner]}
+    transform_cache = dict()
+    scanner_positions = {base_scanner: Vector((0,0,0))}
+
+    done_pairs = set()
+    while len(found_scanners) < len(scanners):
+        progress = False
+        for new_scanner, new_beacons in scanners.items():
+            if new_scanner in found_scanners:
+                continue
+            for known_scanner, known_beacons in found_scanners.items():
+                pair = (new_scanner, known_scanner)
+                if pair in done_pairs:
+                    continue
+                done_pairs.add(pair)
+                result = process_scanner(new_scanner, known_beacons, new_beacons, transform_cache)
+                if result is not None:
+                    found_scanners[new_scanner] = result[0]
+                    scanner_positions[new_scanner] = result[1]
+                    progress = True
+                    print(f"Matched {new_scanner} with {known_scanner} ({len(found_scanners)} of {len(scanners)})",
+                          file=stderr)
+                    break
+        if not progress:
+            raise Exception("failed to match all scanners")
+
+    max_dist = 0
+    for first in scanner_positions.values():
+        for second in scanner_positions.values():
+            max_dist = max(max_dist, m_dist(first, second))
+    return max_dist
+
+if __name__ == "__main__":
+    print(f"Max distance={solve(stdin)}")
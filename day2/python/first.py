@@ -9,9 +9,18 @@ COMMANDS = {
     "up": (0 - 1j)
 }
 
-position = (0 + 0j)
-for command, arg in (line.split() for line in stdin):
-    position += COMMANDS[command.lower()] * int(arg)
-print(f"Horizontal={position.real} Depth={position.imag}")
-print(f"Product={position.real * position.imag}")
+def navigate(stream):
+    position = (0 + 0j)
+    for command, arg in (line.split() for line in stream):
+        position += COMMANDS[command.lower()] * int(arg)
+    return position
+
+def solve(stream):
+    position = navigate(stream)
+    return int(position.real * position.imag)
+
+if __name__ == "__main__":
+    position = navigate(stdin)
+    print(f"Horizontal={position.real} Depth={position.imag}")
+    print(f"Product={position.real * position.imag}")
 
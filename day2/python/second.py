@@ -22,9 +22,12 @@ class Position:
         return self._pos.real * self._pos.imag
 
 
-position = Position()
-for command, arg in (line.split() for line in stdin):
-    position.command(command, int(arg))
-print(position)
-print(f"Product={position.product()}")
+def solve(stream):
+    position = Position()
+    for command, arg in (line.split() for line in stream):
+        position.command(command, int(arg))
+    return int(position.product())
+
+if __name__ == "__main__":
+    print(f"Product={solve(stdin)}")
 
@@ -54,7 +54,6 @@ class Canvas:
             new_background = algorithm[0]
         else:
             new_background = algorithm[511]
-        print("NEW BACKGROUND =", new_background)
         rows = self.rows
         empty = new_background * len(rows[0])
         new_rows = [empty]
@@ -76,9 +75,13 @@ class Canvas:
 def convert(line):
     return line.strip().replace("#", "1").replace(".", "0")
 
-algorithm = convert(stdin.readline())
-canvas = Canvas(convert(line) for line in stdin if line.strip())
-canvas.apply_algorithm(algorithm)
-canvas.apply_algorithm(algorithm)
-print(f"Lit pixels={canvas.count_pixels()}")
+def solve(stream):
+    algorithm = convert(stream.readline())
+    canvas = Canvas(convert(line) for line in stream if line.strip())
+    canvas.apply_algorithm(algorithm)
+    canvas.apply_algorithm(algorithm)
+    return canvas.count_pixels()
+
+if __name__ == "__main__":
+    print(f"Lit pixels={solve(stdin)}")
 
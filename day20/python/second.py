@@ -75,8 +75,12 @@ class Canvas:
 def convert(line):
     return line.strip().replace("#", "1").replace(".", "0")
 
-algorithm = convert(stdin.readline())
-canvas = Canvas(convert(line) for line in stdin if line.strip())
-for i in range(50):
-    canvas.apply_algorithm(algorithm)
-print(f"Lit pixels={canvas.count_pixels()}")
+def solve(stream):
+    algorithm = convert(stream.readline())
+    canvas = Canvas(convert(line) for line in stream if line.strip())
+    for i in range(50):
+        canvas.apply_algorithm(algorithm)
+    return canvas.count_pixels()
+
+if __name__ == "__main__":
+    print(f"Lit pixels={solve(stdin)}")
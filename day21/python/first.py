@@ -12,16 +12,25 @@ def sum_thrice(die):
     for values in zip_longest(*args):
         yield sum(values)
 
-positions = [int(line.split(":", 1)[1].strip()) - 1 for line in stdin]
-scores = [0] * len(positions)
-rolls = 0
-roller = sum_thrice(deterministic_die())
-while max(scores) < 1000:
-    for player in range(len(positions)):
-        positions[player] = (positions[player] + next(roller)) % 10
-        scores[player] += positions[player] + 1
-        rolls += 3
-        if scores[player] >= 1000:
-            break
+def play(stream):
+    "Play until someone reaches 1000, returning (rolls, scores)"
+    positions = [int(line.split(":", 1)[1].strip()) - 1 for line in stream]
+    scores = [0] * len(positions)
+    rolls = 0
+    roller = sum_thrice(deterministic_die())
+    while max(scores) < 1000:
+        for player in range(len(positions)):
+            positions[player] = (positions[player] + next(roller)) % 10
+            scores[player] += positions[player] + 1
+            rolls += 3
+            if scores[player] >= 1000:
+                break
+    return rolls, scores
 
-print(f"Rolls={rolls} Scores={scores} Answer={rolls * min(scores)}")
+def solve(stream):
+    rolls, scores = play(stream)
+    return rolls * min(scores)
+
+if __name__ == "__main__":
+    rolls, scores = play(stdin)
+    print(f"Rolls={rolls} Scores={scores} Answer={rolls * min(scores)}")
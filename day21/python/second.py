@@ -38,7 +38,16 @@ def simulate(wins, universes, scores, state):
         simulate(wins, new_universes, new_scores, next_state)
 
 
-positions = tuple(int(line.split(":", 1)[1].strip()) - 1 for line in stdin)
-wins = [0, 0]
-simulate(wins, 1, (0, 0), (positions[0], positions[1], 0))
-print(f"Player 1 wins={wins[0]} Player 2 wins={wins[1]} Max wins={max(wins)}")
\ No newline at end of file
+def count_wins(stream):
+    "Return the number of universes each player wins in"
+    positions = tuple(int(line.split(":", 1)[1].strip()) - 1 for line in stream)
+    wins = [0, 0]
+    simulate(wins, 1, (0, 0), (positions[0], positions[1], 0))
+    return wins
+
+def solve(stream):
+    return max(count_wins(stream))
+
+if __name__ == "__main__":
+    wins = count_wins(stdin)
+    print(f"Player 1 wins={wins[0]} Player 2 wins={wins[1]} Max wins={max(wins)}")
@@ -37,13 +37,17 @@ def generate_input(fd):
                             int(match.group("zend")))
 
 # For part one, a simple set suffices. 
-cubes_on = set()
-for cube_range in generate_input(stdin):
-    for x in range(max(cube_range.x_start, -50), min(cube_range.x_end, 50) + 1):
-        for y in range(max(cube_range.y_start, -50), min(cube_range.y_end, 50) + 1):
-            for z in range(max(cube_range.z_start, -50), min(cube_range.z_end, 50) + 1):
-                if cube_range.is_on:
-                    cubes_on.add((x, y, z))
-                else:
-                    cubes_on.discard((x, y, z))
-print(f"Cubes on={len(cubes_on)}")
\ No newline at end of file
+def solve(stream):
+    cubes_on = set()
+    for cube_range in generate_input(stream):
+        for x in range(max(cube_range.x_start, -50), min(cube_range.x_end, 50) + 1):
+            for y in range(max(cube_range.y_start, -50), min(cube_range.y_end, 50) + 1):
+                for z in range(max(cube_range.z_start, -50), min(cube_range.z_end, 50) + 1):
+                    if cube_range.is_on:
+                        cubes_on.add((x, y, z))
+                    else:
+                        cubes_on.discard((x, y, z))
+    return len(cubes_on)
+
+if __name__ == "__main__":
+    print(f"Cubes on={solve(stdin)}")
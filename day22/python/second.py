@@ -119,12 +119,15 @@ def add_off_cuboid(previous, to_remove):
     for cuboid in previous:
         yield from split_cuboid(cuboid, to_remove)
 
-on_so_far = set()
-for cuboid in generate_input(stdin):
-    if cuboid.is_on:
-        on_so_far |= set(add_on_cuboid(on_so_far, cuboid))
-    else:
-        on_so_far = set(add_off_cuboid(on_so_far, cuboid))
+def solve(stream):
+    on_so_far = set()
+    for cuboid in generate_input(stream):
+        if cuboid.is_on:
+            on_so_far |= set(add_on_cuboid(on_so_far, cuboid))
+        else:
+            on_so_far = set(add_off_cuboid(on_so_far, cuboid))
 
-total_cubes = sum(i.get_volume() for i in on_so_far)
-print(f"Total cubes on={total_cubes}")
\ No newline at end of file
+    return sum(i.get_volume() for i in on_so_far)
+
+if __name__ == "__main__":
+    print(f"Total cubes on={solve(stdin)}")
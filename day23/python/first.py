@@ -129,5 +129,9 @@ def read_input(fd):
     assert(fd.readline().strip() == "#########")
     return build_rooms(first_row, second_row)
 
-initial_state = read_input(stdin)
-print(greedy_solve(initial_state))
\ No newline at end of file
+def solve(stream):
+    initial_state = read_input(stream)
+    return greedy_solve(initial_state)
+
+if __name__ == "__main__":
+    print(solve(stdin))
@@ -132,5 +132,9 @@ def read_input(fd):
         rows.append(tuple(1 + ord(i) - ord("A") for i in match.groups()))
     return build_rooms(rows)
 
-initial_state = read_input(stdin)
-print(greedy_solve(initial_state))
\ No newline at end of file
+def solve(stream):
+    initial_state = read_input(stream)
+    return greedy_solve(initial_state)
+
+if __name__ == "__main__":
+    print(solve(stdin))
@@ -143,6 +143,9 @@ def Tokeniser(fd):
     for instr, args in (i.strip().split(None, 1) for i in fd):
         yield (instr, args.split(None, 1))
 
-program = list(Tokeniser(stdin))
-solution = recurse_solution(program, Registers())
-print(solution)
\ No newline at end of file
+def solve(stream):
+    program = list(Tokeniser(stream))
+    return recurse_solution(program, Registers())
+
+if __name__ == "__main__":
+    print(solve(stdin))
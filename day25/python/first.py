@@ -29,28 +29,31 @@ def find_moves(grid, x_axis, dim):
                 continue
         yield (coord, cucumber, False)
 
-grid = {}
-max_x = max_y = 0
-for y, row in enumerate(i.strip() for i in stdin):
-    for x, char in enumerate(row):
-        max_x = max(max_x, x)
-        max_y = max(max_y, y)
-        if char in CUCUMBERS:
-            grid[(x, y)] = CUCUMBERS[char]
-dim = (max_x + 1, max_y + 1)
+def solve(stream):
+    grid = {}
+    max_x = max_y = 0
+    for y, row in enumerate(i.strip() for i in stream):
+        for x, char in enumerate(row):
+            max_x = max(max_x, x)
+            max_y = max(max_y, y)
+            if char in CUCUMBERS:
+                grid[(x, y)] = CUCUMBERS[char]
+    dim = (max_x + 1, max_y + 1)
 
-for move_number in count():
-    any_moved = False
-    new_grid = {}
-    for coord, cucumber, moved in find_moves(grid, True, dim):
-        new_grid[coord] = cucumber
-        any_moved = any_moved or moved
-    grid = new_grid
-    new_grid = {}
-    for coord, cucumber, moved in find_moves(grid, False, dim):
-        new_grid[coord] = cucumber
-        any_moved = any_moved or moved
-    grid = new_grid
-    if not any_moved:
-        print(f"Stable after {move_number + 1} steps")
-        break
+    for move_number in count():
+        any_moved = False
+        new_grid = {}
+        for coord, cucumber, moved in find_moves(grid, True, dim):
+            new_grid[coord] = cucumber
+            any_moved = any_moved or moved
+        grid = new_grid
+        new_grid = {}
+        for coord, cucumber, moved in find_moves(grid, False, dim):
+            new_grid[coord] = cucumber
+            any_moved = any_moved or moved
+        grid = new_grid
+        if not any_moved:
+            return move_number + 1
+
+if __name__ == "__main__":
+    print(f"Stable after {solve(stdin)} steps")
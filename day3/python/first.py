@@ -1,23 +1,94 @@
 #!/usr/bin/env python3.10
 
-from collections import Counter
+from pathlib import Path
+import sys
 from sys import stdin
 
-set_bit_counter = Counter()
-total_values = 0
-for binary_str in (line.strip() for line in stdin):
-    total_values += 1
-    for offset in (o for o, v in enumerate(binary_str) if v == "1"):
-        set_bit_counter[offset] += 1
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import line_chunks
 
-gamma_str_list = ["0"] * (max(set_bit_counter.keys()) + 1)
-for offset, count in set_bit_counter.items():
-    if count > total_values / 2:
-        gamma_str_list[offset] = "1"
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-gamma = int("".join(gamma_str_list), 2)
-# Using the fact I know these are 12-bit numbers to simplify the code
-epsilon = (~gamma & 0xFFF)
+class BitColumnCounter:
+    """Count the set bits in each column of a diagnostic report.
 
-print(gamma * epsilon)
+    Columns are numbered from the most significant bit, as they appear in
+    the report, and any word width is supported. Reports can be added
+    incrementally, either as binary text or as integers, and the rates are
+    available at any point from the counts so far.
 
+    Nothing is done per line in Python. For text, each column is counted
+    over the whole chunk at once, using a strided slice and bytes.count()
+    or a NumPy reduction. Integers are unpacked to bits with NumPy if it's
+    available and the words fit in 64 bits.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.mask = (1 << width) - 1
+        self.total = 0
+        self.counts = [0] * width
+
+    def _add_counts(self, column_counts, num_values):
+        self.counts = [a + int(b) for a, b in zip(self.counts, column_counts)]
+        self.total += num_values
+
+    def add_report(self, data):
+        """Add report lines, given as bytes (e.g. b"00100\n11110\n")."""
+        flat = data.translate(None, b"\r\n\t ")
+        if len(flat) % self.width:
+            raise ValueError(f"report lines must all be {self.width} bits wide")
+        if np is not None:
+            bits = np.frombuffer(flat, dtype=np.uint8).reshape(-1, self.width)
+            column_counts = np.count_nonzero(bits == ord("1"), axis=0)
+        else:
+            column_counts = [flat[col::self.width].count(b"1") for col in range(self.width)]
+        self._add_counts(column_counts, len(flat) // self.width)
+
+    def add_values(self, values):
+        """Add report words given as integers (or a NumPy integer array)."""
+        if np is not None and self.width <= 64:
+            packed = np.asarray(values, dtype=np.uint64)
+            # View each word as 8 big-endian bytes and unpack those to bits,
+            # so column 0 ends up as the most significant bit.
+            bits = np.unpackbits(packed.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+            self._add_counts(bits[:, 64 - self.width:].sum(axis=0), len(packed))
+        else:
+            self.add_report("".join(format(i & self.mask, f"0{self.width}b")
+                                    for i in values).encode())
+
+    def feed(self, stream):
+        """Add every line of a report stream, a chunk at a time."""
+        for chunk in line_chunks(stream):
+            self.add_report(chunk)
+
+    @property
+    def gamma(self):
+        value = 0
+        for count in self.counts:
+            value = (value << 1) | (2 * count > self.total)
+        return value
+
+    @property
+    def epsilon(self):
+        return ~self.gamma & self.mask
+
+    @classmethod
+    def from_stream(cls, stream):
+        counter = None
+        for chunk in line_chunks(stream):
+            if counter is None:
+                counter = cls(len(chunk.split(None, 1)[0]))
+            counter.add_report(chunk)
+        return counter
+
+def solve(stream):
+    counter = BitColumnCounter.from_stream(stream)
+    return counter.gamma * counter.epsilon
+
+if __name__ == "__main__":
+    print(solve(stdin))
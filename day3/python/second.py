@@ -1,27 +1,47 @@
 #!/usr/bin/env python3.10
 
-from collections import Counter
+from bisect import bisect_left
+from pathlib import Path
+import sys
 from sys import stdin
 
-oxygen_set = set(line.strip() for line in stdin)
-co2_set = oxygen_set.copy()
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import open_buffer
 
-def get_mcb(values, offset):
-    count = sum(1 for i in values if i[offset] == "1")
-    if count == len(values) - count:
-        return "1"
-    else:
-        return "1" if count > (len(values) / 2) else "0"
+# With the values sorted as integers, the ones still in contention after
+# filtering on the top bits are always a contiguous range, because they
+# share those bits as a common prefix. Within that range, the values with
+# the next bit clear all sort before the ones with it set, so a single
+# bisect finds the boundary and tells us both counts. Each step narrows
+# [lo, hi) in O(log n) without copying anything.
 
-for offset in range(0, 12):
-    if len(oxygen_set) > 1:
-        mcb = get_mcb(oxygen_set, offset)
-        oxygen_set = {i for i in oxygen_set if i[offset] == mcb}
-    if len(co2_set) > 1:
-        mcb = get_mcb(co2_set, offset)
-        co2_set = {i for i in co2_set if i[offset] != mcb}
+def find_rating(values, width, keep_most_common):
+    lo, hi = 0, len(values)
+    for bit in range(width - 1, -1, -1):
+        if hi - lo <= 1:
+            break
+        prefix = (values[lo] >> (bit + 1)) << (bit + 1)
+        mid = bisect_left(values, prefix | (1 << bit), lo, hi)
+        zeros, ones = mid - lo, hi - mid
+        if not zeros or not ones:
+            # Everything left agrees on this bit, so there's nothing to drop.
+            continue
+        # Ties count as 1 being most common.
+        if (ones >= zeros) == keep_most_common:
+            lo = mid
+        else:
+            hi = mid
+    return values[lo]
 
-oxygen_value = int(oxygen_set.pop(), 2)
-co2_value = int(co2_set.pop(), 2)
-print(f"Oxygen={oxygen_value} CO2={co2_value} Product={oxygen_value * co2_value}")
+def solve(stream):
+    with open_buffer(stream) as buffer:
+        words = buffer[:].split()
+    width = len(words[0])
+    values = sorted(set(int(i, 2) for i in words))
+    oxygen_value = find_rating(values, width, True)
+    co2_value = find_rating(values, width, False)
+    return oxygen_value * co2_value
 
+if __name__ == "__main__":
+    print(f"Product={solve(stdin)}")
@@ -1,54 +1,66 @@
 #!/usr/bin/env python3.10
 
+import math
 from sys import stdin
 
+# Rather than marking numbers as they're drawn, we index the draw order by
+# number so each cell knows the turn it gets marked. A line is complete on
+# the latest turn of any of its cells, and a board wins on the earliest
+# turn of any of its lines. That's one pass over every cell, after which
+# boards can be ranked by winning turn to find any winner we like.
+
+NEVER = math.inf
+
 class Board:
 
     def __init__(self, rows):
-        self.all_values = set()
-        self.row_lines = []
-        self.col_lines = None
-        for row in ([int(i.strip()) for i in row.split()] for row in rows):
-            self.row_lines.append(set(row))
-            self.all_values.update(self.row_lines[-1])
-            if self.col_lines is None:
-                self.col_lines = [set() for i in row]
-            for offset, value in enumerate(row):
-                self.col_lines[offset].add(value)
-        self.marked = set()
-
-    def check_win(self, number):
-        if number not in self.all_values:
-            return False
-        self.marked.add(number)
-        for line in self.row_lines + self.col_lines:
-            if len(line) == len(line & self.marked):
-                return True
-
-    def sum_unmarked(self):
-        return sum(sum(i for i in line if i not in self.marked)
-                   for line in self.row_lines)
-
-draw_order = [int(i) for i in stdin.readline().split(",")]
-boards = []
-rows = []
-for line in (i.strip() for i in stdin):
-    if not line:
-        if rows:
-            boards.append(Board(rows))
-            rows = []
-        continue
-    rows.append(line)
-if rows:
-    boards.append(Board(rows))
-
-for draw in draw_order:
-    for board in boards:
-        if board.check_win(draw):
-            board_sum = board.sum_unmarked()
-            print(f"Draw={draw} Sum={board_sum} Product={draw * board_sum}")
-            break
-    else:
-        continue
-    break
+        self.rows = [[int(i) for i in row.split()] for row in rows]
+
+    def win_turn(self, turns):
+        cell_turns = [[turns.get(value, NEVER) for value in row] for row in self.rows]
+        return min(min(max(row) for row in cell_turns),
+                   min(max(col) for col in zip(*cell_turns)))
+
+    def sum_unmarked(self, turns, turn):
+        return sum(value for row in self.rows for value in row
+                   if turns.get(value, NEVER) > turn)
+
+def rank_winners(draw_order, boards):
+    """Return (turn, board index, score) for each board that wins, in order.
+
+    Boards completing a line on the same turn are ordered as they appear
+    in the input.
+    """
+    turns = {}
+    for turn, draw in enumerate(draw_order):
+        turns.setdefault(draw, turn)
+    winners = []
+    for index, board in enumerate(boards):
+        turn = board.win_turn(turns)
+        if turn != NEVER:
+            winners.append((turn, index, draw_order[turn] * board.sum_unmarked(turns, turn)))
+    winners.sort()
+    return winners
+
+def read_boards(stream):
+    draw_order = [int(i) for i in stream.readline().split(",")]
+    boards = []
+    rows = []
+    for line in (i.strip() for i in stream):
+        if not line:
+            if rows:
+                boards.append(Board(rows))
+                rows = []
+            continue
+        rows.append(line)
+    if rows:
+        boards.append(Board(rows))
+    return draw_order, boards
+
+def solve(stream):
+    draw_order, boards = read_boards(stream)
+    turn, index, score = rank_winners(draw_order, boards)[0]
+    return score
 
+if __name__ == "__main__":
+    print(f"Product={solve(stdin)}")
@@ -1,59 +1,94 @@
 #!/usr/bin/env python3.10
 
+from collections import defaultdict
 from sys import stdin
 
+# Boards can join at any time and numbers are called one by one, so rather
+# than checking every board on each draw we keep an index from each value
+# to the cells holding it. A draw then only touches the boards containing
+# that number, bumping a hit counter for the row and column of each cell,
+# and a line is complete once its counter reaches the line's length. The
+# sum of unmarked cells is kept up to date as we go, so scoring a win is
+# free too.
+
 class Board:
 
     def __init__(self, rows):
-        self.all_values = set()
-        self.row_lines = []
-        self.col_lines = None
-        for row in ([int(i.strip()) for i in row.split()] for row in rows):
-            self.row_lines.append(set(row))
-            self.all_values.update(self.row_lines[-1])
-            if self.col_lines is None:
-                self.col_lines = [set() for i in row]
-            for offset, value in enumerate(row):
-                self.col_lines[offset].add(value)
-        self.marked = set()
-        self.won = False
-
-    def check_win(self, number):
-        if number not in self.all_values:
-            return False
-        self.marked.add(number)
-        for line in self.row_lines + self.col_lines:
-            if len(line) == len(line & self.marked):
-                self.won = True
-                return True
-
-    def sum_unmarked(self):
-        return sum(sum(i for i in line if i not in self.marked)
-                   for line in self.row_lines)
-
-draw_order = [int(i) for i in stdin.readline().split(",")]
-boards = []
-rows = []
-for line in (i.strip() for i in stdin):
-    if not line:
-        if rows:
-            boards.append(Board(rows))
-            rows = []
-        continue
-    rows.append(line)
-if rows:
-    boards.append(Board(rows))
-
-remaining_boards = len(boards)
-for draw in draw_order:
-    for board in (i for i in boards if not i.won):
-        if board.check_win(draw):
-            remaining_boards -= 1
-            if remaining_boards == 0:
-                board_sum = board.sum_unmarked()
-                print(f"Draw={draw} Sum={board_sum} Product={draw * board_sum}")
-                break
-    else:
-        continue
-    break
+        self.rows = [[int(i) for i in row.split()] for row in rows]
+
+class BingoHall:
+    """Plays any number of boards against numbers as they're drawn.
+
+    A board only counts draws made after it's registered, and a number
+    drawn a second time has no further effect, even on boards registered
+    in between.
+    """
+
+    def __init__(self):
+        self.cells = defaultdict(list)
+        self.drawn = set()
+        self.line_hits = []
+        self.line_lengths = []
+        self.unmarked = []
+        self.won = []
+
+    def register(self, board):
+        """Add a board to the game and return its ID."""
+        board_id = len(self.won)
+        height = len(board.rows)
+        width = len(board.rows[0])
+        for row, values in enumerate(board.rows):
+            for col, value in enumerate(values):
+                if value not in self.drawn:
+                    self.cells[value].append((board_id, row, height + col))
+        self.line_hits.append([0] * (height + width))
+        self.line_lengths.append([width] * height + [height] * width)
+        self.unmarked.append(sum(map(sum, board.rows)))
+        self.won.append(False)
+        return board_id
+
+    def draw(self, value):
+        """Mark a number, returning (board ID, score) for each new winner."""
+        winners = []
+        self.drawn.add(value)
+        for board_id, row, col in self.cells.pop(value, ()):
+            if self.won[board_id]:
+                continue
+            hits = self.line_hits[board_id]
+            lengths = self.line_lengths[board_id]
+            hits[row] += 1
+            hits[col] += 1
+            self.unmarked[board_id] -= value
+            if hits[row] == lengths[row] or hits[col] == lengths[col]:
+                self.won[board_id] = True
+                winners.append((board_id, value * self.unmarked[board_id]))
+        return winners
+
+def read_boards(stream):
+    draw_order = [int(i) for i in stream.readline().split(",")]
+    boards = []
+    rows = []
+    for line in (i.strip() for i in stream):
+        if not line:
+            if rows:
+                boards.append(Board(rows))
+                rows = []
+            continue
+        rows.append(line)
+    if rows:
+        boards.append(Board(rows))
+    return draw_order, boards
+
+def solve(stream):
+    draw_order, boards = read_boards(stream)
+    hall = BingoHall()
+    for board in boards:
+        hall.register(board)
+    last_score = None
+    for value in draw_order:
+        for board_id, score in hall.draw(value):
+            last_score = score
+    return last_score
 
+if __name__ == "__main__":
+    print(f"Product={solve(stdin)}")
@@ -1,20 +1,77 @@
 #!/usr/bin/env python3.10
 
 from collections import Counter
+from pathlib import Path
+import sys
 from sys import stdin
 
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import ints
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# When NumPy is available every point of every line is generated at once
+# as index arrays, and these are accumulated into a dense grid covering the
+# bounds of the input. The overlaps are then just the cells over 1. A cell
+# can't be hit more than once per line, so the number of lines tells us how
+# narrow a dtype we can get away with. Inputs spread so wide that the grid
+# wouldn't fit in memory fall back to counting points in a dict.
+
+GRID_LIMIT = 1 << 28
+
 def cmp(a, b):
     return (a > b) - (a < b)
 
-intersection_counter = Counter()
-for line in stdin:
-    start, end = ([int(j) for j in i.strip().split(",")] for i in line.split("->"))
-    x_inc = cmp(end[0], start[0])
-    y_inc = cmp(end[1], start[1])
-    if x_inc * y_inc != 0:
-        continue
-    for i in range(max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1):
-        intersection_counter[(start[0] + x_inc * i, start[1] + y_inc * i)] += 1
+def counter_overlaps(values):
+    intersection_counter = Counter()
+    # Each line is "x1,y1 -> x2,y2", so take the numbers four at a time.
+    for start_x, start_y, end_x, end_y in zip(*[iter(values)] * 4):
+        start, end = (start_x, start_y), (end_x, end_y)
+        x_inc = cmp(end[0], start[0])
+        y_inc = cmp(end[1], start[1])
+        if x_inc * y_inc != 0:
+            continue
+        for i in range(max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1):
+            intersection_counter[(start[0] + x_inc * i, start[1] + y_inc * i)] += 1
+    return sum(1 for v in intersection_counter.values() if v > 1)
+
+def numpy_overlaps(values):
+    segments = np.array(values, dtype=np.int64).reshape(-1, 4)
+    # Only horizontal and vertical lines count for this part.
+    segments = segments[(segments[:, 0] == segments[:, 2]) | (segments[:, 1] == segments[:, 3])]
+    if not len(segments):
+        return 0
+    start_x, start_y, end_x, end_y = segments.T
+    min_x = min(start_x.min(), end_x.min())
+    min_y = min(start_y.min(), end_y.min())
+    width = int(max(start_x.max(), end_x.max()) - min_x + 1)
+    height = int(max(start_y.max(), end_y.max()) - min_y + 1)
+    if width * height > GRID_LIMIT:
+        return None
+    x_inc = np.sign(end_x - start_x)
+    y_inc = np.sign(end_y - start_y)
+    lengths = np.maximum(np.abs(end_x - start_x), np.abs(end_y - start_y)) + 1
+    # Step number of each point along its own line.
+    first_point = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    steps = np.arange(first_point.size) - first_point
+    xs = np.repeat(start_x - min_x, lengths) + np.repeat(x_inc, lengths) * steps
+    ys = np.repeat(start_y - min_y, lengths) + np.repeat(y_inc, lengths) * steps
+    dtype = np.uint16 if len(segments) <= np.iinfo(np.uint16).max else np.uint32
+    grid = np.zeros(width * height, dtype=dtype)
+    np.add.at(grid, ys * width + xs, 1)
+    return int(np.count_nonzero(grid > 1))
 
-print(f"Intersections={sum(1 for v in intersection_counter.values() if v > 1)}")
+def solve(stream):
+    values = ints(stream)
+    if np is not None:
+        overlaps = numpy_overlaps(values)
+        if overlaps is not None:
+            return overlaps
+    return counter_overlaps(values)
 
+if __name__ == "__main__":
+    print(f"Intersections={solve(stdin)}")
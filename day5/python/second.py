@@ -1,18 +1,193 @@
 #!/usr/bin/env python3.10
 
-from collections import Counter
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import combinations
+from operator import itemgetter
+from pathlib import Path
+import sys
 from sys import stdin
 
-def cmp(a, b):
-    return (a > b) - (a < b)
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import ints
 
-intersection_counter = Counter()
-for line in stdin:
-    start, end = ([int(j) for j in i.strip().split(",")] for i in line.split("->"))
-    x_inc = cmp(end[0], start[0])
-    y_inc = cmp(end[1], start[1])
-    for i in range(max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1):
-        intersection_counter[(start[0] + x_inc * i, start[1] + y_inc * i)] += 1
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-print(f"Intersections={sum(1 for v in intersection_counter.values() if v > 1)}")
+# When NumPy is available every point of every line is generated at once
+# as index arrays, and these are accumulated into a dense grid covering the
+# bounds of the input. The overlaps are then just the cells over 1. A cell
+# can't be hit more than once per line, so the number of lines tells us how
+# narrow a dtype we can get away with.
+#
+# Inputs spread too wide for a grid (or without NumPy) are handled
+# geometrically instead, so the cost depends on the number of lines rather
+# than their length. Lines going the same way are grouped by the line they
+# lie along and merged as intervals, which gives both their combined
+# coverage and the stretches covered more than once. A sweep then finds
+# where the merged lines going different ways cross. A point counts if it
+# was covered twice along one line or is a crossing, taking care not to
+# count it twice if it's both.
 
+GRID_LIMIT = 1 << 28
+
+# Each direction of line (horizontal, vertical, and the two diagonals) is
+# a family of parallel lines with a normal: a point p lies on line k of the
+# family if normal . p == k. Along a line, a point is identified by its x
+# coordinate, or its y coordinate for vertical lines.
+NORMALS = ((0, 1), (1, 0), (1, -1), (1, 1))
+VERTICAL = 1
+
+def line_family(start_x, start_y, end_x, end_y):
+    dx = end_x - start_x
+    dy = end_y - start_y
+    if dy == 0:
+        return 0
+    if dx == 0:
+        return VERTICAL
+    if dx == dy:
+        return 2
+    if dx == -dy:
+        return 3
+    raise ValueError("lines must be horizontal, vertical or at 45 degrees")
+
+def line_key(family, x, y):
+    normal_x, normal_y = NORMALS[family]
+    return normal_x * x + normal_y * y
+
+def position(family, x, y):
+    return y if family == VERTICAL else x
+
+def point_at(family, key, pos):
+    if family == VERTICAL:
+        return key, pos
+    normal_x, normal_y = NORMALS[family]
+    # normal_y is always 1 or -1 here, so multiplying is dividing.
+    return pos, (key - normal_x * pos) * normal_y
+
+def crossing(family1, key1, family2, key2):
+    "Where two lines from different families cross, or None if not a lattice point"
+    x1, y1 = NORMALS[family1]
+    x2, y2 = NORMALS[family2]
+    det = x1 * y2 - y1 * x2
+    x, x_rem = divmod(key1 * y2 - y1 * key2, det)
+    y, y_rem = divmod(x1 * key2 - key1 * x2, det)
+    return None if x_rem or y_rem else (x, y)
+
+def merge_intervals(intervals):
+    "Return (union, covered at least twice) of inclusive intervals, both sorted"
+    events = sorted([(lo, 1) for lo, hi in intervals] + [(hi + 1, -1) for lo, hi in intervals])
+    union = []
+    multiple = []
+    depth = 0
+    for pos, change in events:
+        if depth == 0 and change > 0:
+            union.append([pos, None])
+        elif depth == 2 and change < 0:
+            multiple[-1][1] = pos - 1
+        depth += change
+        if depth == 0:
+            union[-1][1] = pos - 1
+        elif depth == 2 and change > 0:
+            multiple.append([pos, None])
+    return [tuple(i) for i in union], [tuple(i) for i in multiple]
+
+def covers(intervals, pos):
+    index = bisect_right(intervals, pos, key=itemgetter(0)) - 1
+    return index >= 0 and intervals[index][1] >= pos
+
+def find_crossings(family1, lines1, family2, lines2):
+    """Yield the lattice points where lines from two families cross.
+
+    This sweeps through the keys of the first family in order. Each stretch
+    of line from the second family is active over the range of first-family
+    keys it passes through, and each stretch from the first family looks up
+    the active lines whose keys fall within the range that it passes through.
+    """
+    events = []
+    for key2, intervals in lines2.items():
+        for lo, hi in intervals:
+            ends = sorted(line_key(family1, *point_at(family2, key2, pos)) for pos in (lo, hi))
+            events.append((ends[0], 0, key2))
+            events.append((ends[1], 2, key2))
+    for key1, intervals in lines1.items():
+        for lo, hi in intervals:
+            ends = sorted(line_key(family2, *point_at(family1, key1, pos)) for pos in (lo, hi))
+            events.append((key1, 1, *ends))
+    events.sort()
+    active = []
+    for key1, kind, *keys in events:
+        if kind == 0:
+            insort(active, keys[0])
+        elif kind == 2:
+            del active[bisect_left(active, keys[0])]
+        else:
+            for key2 in active[bisect_left(active, keys[0]):bisect_right(active, keys[1])]:
+                point = crossing(family1, key1, family2, key2)
+                if point is not None:
+                    yield point
+
+def sweep_overlaps(values):
+    families = [defaultdict(list) for i in NORMALS]
+    # Each line is "x1,y1 -> x2,y2", so take the numbers four at a time.
+    for start_x, start_y, end_x, end_y in zip(*[iter(values)] * 4):
+        family = line_family(start_x, start_y, end_x, end_y)
+        ends = sorted((position(family, start_x, start_y), position(family, end_x, end_y)))
+        families[family][line_key(family, start_x, start_y)].append(ends)
+    overlaps = 0
+    unions = []
+    multiples = []
+    for lines in families:
+        unions.append({})
+        multiples.append({})
+        for key, intervals in lines.items():
+            unions[-1][key], multiples[-1][key] = merge_intervals(intervals)
+            overlaps += sum(hi - lo + 1 for lo, hi in multiples[-1][key])
+    crossings = set()
+    for family1, family2 in combinations(range(len(NORMALS)), 2):
+        crossings.update(find_crossings(family1, unions[family1], family2, unions[family2]))
+    overlaps += len(crossings)
+    for x, y in crossings:
+        for family, multiple in enumerate(multiples):
+            intervals = multiple.get(line_key(family, x, y))
+            if intervals and covers(intervals, position(family, x, y)):
+                overlaps -= 1
+    return overlaps
+
+def numpy_overlaps(values):
+    segments = np.array(values, dtype=np.int64).reshape(-1, 4)
+    if not len(segments):
+        return 0
+    start_x, start_y, end_x, end_y = segments.T
+    min_x = min(start_x.min(), end_x.min())
+    min_y = min(start_y.min(), end_y.min())
+    width = int(max(start_x.max(), end_x.max()) - min_x + 1)
+    height = int(max(start_y.max(), end_y.max()) - min_y + 1)
+    if width * height > GRID_LIMIT:
+        return None
+    x_inc = np.sign(end_x - start_x)
+    y_inc = np.sign(end_y - start_y)
+    lengths = np.maximum(np.abs(end_x - start_x), np.abs(end_y - start_y)) + 1
+    # Step number of each point along its own line.
+    first_point = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    steps = np.arange(first_point.size) - first_point
+    xs = np.repeat(start_x - min_x, lengths) + np.repeat(x_inc, lengths) * steps
+    ys = np.repeat(start_y - min_y, lengths) + np.repeat(y_inc, lengths) * steps
+    dtype = np.uint16 if len(segments) <= np.iinfo(np.uint16).max else np.uint32
+    grid = np.zeros(width * height, dtype=dtype)
+    np.add.at(grid, ys * width + xs, 1)
+    return int(np.count_nonzero(grid > 1))
+
+def solve(stream):
+    values = ints(stream)
+    if np is not None:
+        overlaps = numpy_overlaps(values)
+        if overlaps is not None:
+            return overlaps
+    return sweep_overlaps(values)
+
+if __name__ == "__main__":
+    print(f"Intersections={solve(stdin)}")
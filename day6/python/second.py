@@ -1,20 +1,79 @@
 #!/usr/bin/env python3.10
 
 from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+import sys
 from sys import stdin
 
-fish = Counter()
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import comma_ints
 
-for value in (int(i) for i in stdin.readline().split(",")):
-    fish[value] += 1
+# Every fish with the same timer behaves the same, so a day is a linear map
+# from counts per timer to counts per timer, i.e. a matrix. After N days
+# that's the Nth power of the matrix, which squaring gets in O(log N)
+# multiplies. Better still, we only ever want the total, so we can work out
+# once how many fish a single fish with each timer becomes, and then any
+# number of schools is just a weighted sum of their counts.
+#
+# The counts grow exponentially, so very long horizons need a modulus to
+# keep the numbers to a sensible size.
 
-for day in range(256):
-    breeding = fish[0]
-    for i in range(max(fish.keys())):
-        fish[i] = fish[i+1]
-        fish[i+1] = 0
-    fish[6] += breeding
-    fish[8] += breeding
+RESET_TIMER = 6
+NEWBORN_TIMER = 8
+DAYS = 256
 
-print(f"Total fish={sum(fish.values())}")
+def transition_matrix(reset=RESET_TIMER, newborn=NEWBORN_TIMER):
+    "Entry [i][j] is the number of fish with timer j that one with timer i becomes a day later"
+    if not 0 <= reset <= newborn:
+        raise ValueError("reset timer must be between 0 and the newborn timer")
+    size = newborn + 1
+    matrix = [[0] * size for i in range(size)]
+    for timer in range(1, size):
+        matrix[timer][timer - 1] = 1
+    matrix[0][reset] += 1
+    matrix[0][newborn] += 1
+    return matrix
 
+def mat_mult(a, b, modulus=None):
+    columns = list(zip(*b))
+    result = [[sum(x * y for x, y in zip(row, column)) for column in columns] for row in a]
+    if modulus is not None:
+        result = [[value % modulus for value in row] for row in result]
+    return result
+
+def mat_vec(matrix, vector, modulus=None):
+    result = [sum(x * y for x, y in zip(row, vector)) for row in matrix]
+    if modulus is not None:
+        result = [value % modulus for value in result]
+    return result
+
+@lru_cache
+def descendants(days, reset=RESET_TIMER, newborn=NEWBORN_TIMER, modulus=None):
+    "Return how many fish a single fish with each timer value becomes after `days`"
+    matrix = transition_matrix(reset, newborn)
+    totals = [1] * (newborn + 1)
+    while days:
+        if days & 1:
+            totals = mat_vec(matrix, totals, modulus)
+        days >>= 1
+        if days:
+            matrix = mat_mult(matrix, matrix, modulus)
+    return tuple(totals)
+
+def population(timers, days, reset=RESET_TIMER, newborn=NEWBORN_TIMER, modulus=None):
+    "Return the size of a school of fish after `days`, optionally modulo `modulus`"
+    weights = descendants(days, reset, newborn, modulus)
+    total = 0
+    for timer, count in Counter(timers).items():
+        if not 0 <= timer <= newborn:
+            raise ValueError(f"timer {timer} is outside the range 0-{newborn}")
+        total += weights[timer] * count
+    return total if modulus is None else total % modulus
+
+def solve(stream):
+    return population(comma_ints(stream), DAYS)
+
+if __name__ == "__main__":
+    print(f"Total fish={solve(stdin)}")
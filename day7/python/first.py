@@ -1,12 +1,66 @@
 #!/usr/bin/env python3.10
 
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+import sys
 from sys import stdin
 
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import comma_ints
+
 # It's fairly clear that the median value will be the optimum to minimise
 # total displacement from the chosen point, so we just need to calculate
 # that and then determine the total offset from it.
+#
+# The positions are small integers, so rather than sorting we count how
+# many crabs are at each one. Running totals of those counts give the
+# position of any rank (and hence any percentile) with a binary search,
+# and running totals of the positions themselves give the displacement to
+# any target without looking at the crabs again: the crabs below the
+# target contribute (target * count - sum) and those above the reverse.
+
+class CrabHistogram:
+
+    def __init__(self, positions):
+        positions = list(positions)
+        if not positions:
+            raise ValueError("need at least one position")
+        self.lowest = min(positions)
+        counts = [0] * (max(positions) - self.lowest + 1)
+        for position in positions:
+            counts[position - self.lowest] += 1
+        # Entry i covers the crabs at positions below lowest + i.
+        self.cum_counts = list(accumulate(counts, initial=0))
+        self.cum_sums = list(accumulate((count * (self.lowest + i) for i, count in enumerate(counts)),
+                                        initial=0))
+        self.count = self.cum_counts[-1]
+        self.total = self.cum_sums[-1]
+
+    def position_at_rank(self, rank):
+        "Return the position of the crab at (zero-based) `rank` in sorted order"
+        if not 0 <= rank < self.count:
+            raise IndexError("rank out of range")
+        return self.lowest + bisect_right(self.cum_counts, rank) - 1
+
+    def percentile(self, pct):
+        return self.position_at_rank(min(self.count - 1, self.count * pct // 100))
+
+    def median(self):
+        return self.percentile(50)
+
+    def displacement(self, target):
+        "Return the total distance of every crab from `target`"
+        index = min(max(target - self.lowest, 0), len(self.cum_counts) - 1)
+        below = self.cum_counts[index]
+        below_sum = self.cum_sums[index]
+        above = self.count - below
+        return (target * below - below_sum) + (self.total - below_sum - target * above)
 
-points = [int(i) for i in stdin.readline().split(",")]
-median = sorted(points)[len(points)//2]
-print(sum(abs(median-i) for i in points))
+def solve(stream):
+    crabs = CrabHistogram(comma_ints(stream))
+    return crabs.displacement(crabs.median())
 
+if __name__ == "__main__":
+    print(solve(stdin))
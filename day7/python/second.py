@@ -1,14 +1,108 @@
 #!/usr/bin/env python3.10
 
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+import sys
 from sys import stdin
+from typing import NamedTuple
+
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import comma_ints
 
 # Making increased moves more expensive just changes the problem to
 # use the mean instead of the median.
+#
+# Well, nearly: the optimum is within half a step of the mean, but that can
+# be either side of it, so rounding the mean isn't guaranteed to find it.
+# Instead, the total fuel is convex in the target, so a ternary search over
+# the range of positions is. Each total is quick to find too, since for
+# crabs below the target the distances sum to (target * count - sum) and
+# their squares to (target^2 * count - 2 * target * sum + sum of squares),
+# and similarly above it. With running totals of counts, positions and
+# squares over the distinct positions, that's a binary search for where the
+# target falls for any cost that's a polynomial of degree 2 or less in the
+# distance, which covers all the usual ones. Any other cost can still be
+# used, it just gets summed over the histogram. Only occupied positions are
+# stored, so crabs spread over a huge range cost no more than bunched up.
+
+class Cost(NamedTuple):
+    """Cost of moving a distance d: (quadratic * d^2 + linear * d + constant) // divisor.
+
+    The division must be exact for every distance (as it is for triangular
+    numbers), otherwise totals won't match summing the costs one by one.
+    """
+    quadratic: int
+    linear: int
+    constant: int = 0
+    divisor: int = 1
+
+    def __call__(self, distance):
+        return (self.quadratic * distance * distance + self.linear * distance
+                + self.constant) // self.divisor
+
+LINEAR = Cost(0, 1)
+TRIANGULAR = Cost(1, 1, 0, 2)
+QUADRATIC = Cost(1, 0)
+
+class CrabHistogram:
+
+    def __init__(self, positions):
+        histogram = sorted(Counter(positions).items())
+        if not histogram:
+            raise ValueError("need at least one position")
+        self.positions = positions = [position for position, count in histogram]
+        self.counts = counts = [count for position, count in histogram]
+        self.lowest = positions[0]
+        self.highest = positions[-1]
+        # Entry i covers the crabs at positions[:i].
+        self.cum_counts = list(accumulate(counts, initial=0))
+        self.cum_sums = list(accumulate(map(int.__mul__, counts, positions), initial=0))
+        self.cum_squares = list(accumulate((count * position * position
+                                            for count, position in zip(counts, positions)),
+                                           initial=0))
+
+    def distance_sums(self, target):
+        "Return the sums of distances and squared distances of every crab from `target`"
+        index = bisect_left(self.positions, target)
+        count, total, squares = self.cum_counts[index], self.cum_sums[index], self.cum_squares[index]
+        above_count = self.cum_counts[-1] - count
+        above_total = self.cum_sums[-1] - total
+        above_squares = self.cum_squares[-1] - squares
+        distances = (target * count - total) + (above_total - target * above_count)
+        squared = (target * target * count - 2 * target * total + squares
+                   + above_squares - 2 * target * above_total + target * target * above_count)
+        return distances, squared
+
+    def fuel(self, target, cost=TRIANGULAR):
+        "Return the total fuel for every crab to move to `target`"
+        if isinstance(cost, Cost):
+            distances, squared = self.distance_sums(target)
+            # Each crab's cost divides exactly, so the sum does too.
+            return (cost.quadratic * squared + cost.linear * distances
+                    + cost.constant * self.cum_counts[-1]) // cost.divisor
+        return sum(count * cost(abs(target - position))
+                   for position, count in zip(self.positions, self.counts))
+
+    def min_fuel(self, cost=TRIANGULAR):
+        """Return (target, fuel) minimising the total fuel.
 
-def triangular(n):
-    return (n * (n+1)) / 2
+        `cost` must be a non-decreasing convex function of distance.
+        """
+        low, high = self.lowest, self.highest
+        while high - low > 2:
+            third = (high - low) // 3
+            if self.fuel(low + third, cost) <= self.fuel(high - third, cost):
+                high -= third
+            else:
+                low += third + 1
+        return min(((self.fuel(target, cost), target) for target in range(low, high + 1)))[::-1]
 
-points = [int(i) for i in stdin.readline().split(",")]
-mean = int(sum(points) / len(points))
-print(f"Mean={mean} Total fuel={sum(triangular(abs(i - mean)) for i in points)}")
+def solve(stream):
+    target, fuel = CrabHistogram(comma_ints(stream)).min_fuel(TRIANGULAR)
+    return fuel
 
+if __name__ == "__main__":
+    print(f"Total fuel={solve(stdin)}")
@@ -1,68 +1,111 @@
 #!/usr/bin/env python3.10
 
+from functools import lru_cache
+from pathlib import Path
+import sys
 from sys import stdin
 
-class Mapper:
-    """Work out mapping from segment sets to values.
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import lines, open_buffer
 
-    This class uses a deductive approach in two passes. In the first pass,
-    it simply looks for the digits with unique numbers of segments.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    In the second pass, it looks for intersections with the digits it's
-    already determined to differentiate between multiple digits with the
-    same number of segments. For example, a combination with 5 segments
-    could be 2, 3 or 5. However, only 3 has two segments in common with 1,
-    and from the remaining two possibilities only 5 has 3 segments in common
-    with 4.
+# Rather than deducing digits from how their segments overlap, we can use
+# the fact that every display shows all ten digits. Across those ten, each
+# segment is lit a fixed number of times (e.g. the bottom left one only in
+# 0, 2, 6 and 8), and adding up those counts over the segments of each digit
+# happens to give ten different totals. So counting how often each wire
+# appears in the signal patterns identifies every pattern's digit at once,
+# however the wires are jumbled.
+#
+# Patterns are stored as 7-bit masks, one bit per wire, which turns each
+# display's wiring into a 128-entry table from mask to digit.
+
+DIGIT_SEGMENTS = ("abcefg", "cf", "acdeg", "acdfg", "bcdf",
+                  "abdfg", "abdefg", "acf", "abcdefg", "abcdfg")
+
+SEGMENT_COUNTS = {segment: "".join(DIGIT_SEGMENTS).count(segment) for segment in "abcdefg"}
+SCORE_DIGITS = {sum(SEGMENT_COUNTS[i] for i in segments): digit
+                for digit, segments in enumerate(DIGIT_SEGMENTS)}
+
+# The wires lit in each of the 128 possible masks.
+MASK_WIRES = [tuple(wire for wire in range(7) if mask >> wire & 1) for mask in range(128)]
+
+# Masks of the patterns seen so far. There are only so many ways to write
+# each of the 127 possible patterns, so this stays small.
+pattern_masks = {}
+
+def encode(pattern):
+    "Convert a pattern such as b'cfbegad' to a bitmask"
+    try:
+        return pattern_masks[pattern]
+    except KeyError:
+        mask = 0
+        for char in pattern:
+            mask |= 1 << (char - 97)
+        pattern_masks[pattern] = mask
+        return mask
+
+# The same wirings tend to turn up again and again, so tables are cached by
+# the sorted masks of the signal patterns, which are the same however the
+# patterns are ordered or written. wiring_table.cache_info() reports the
+# hits and misses, for sizing the cache.
+WIRING_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=WIRING_CACHE_SIZE)
+def wiring_table(signature):
+    "Return a 128-entry table from mask to digit for a sorted tuple of signal masks"
+    counts = [sum(mask >> wire & 1 for mask in signature) for wire in range(7)]
+    table = [None] * 128
+    for mask in signature:
+        table[mask] = SCORE_DIGITS[sum(map(counts.__getitem__, MASK_WIRES[mask]))]
+    return tuple(table)
+
+def solve_wiring(signals):
+    "Return the mask to digit table for a line's ten signal patterns"
+    return wiring_table(tuple(sorted(map(encode, signals.split()))))
+
+def decode_line(line):
+    signals, outputs = line.split(b"|", 1)
+    table = solve_wiring(signals)
+    value = 0
+    for pattern in outputs.split():
+        value = value * 10 + table[encode(pattern)]
+    return value
+
+def numpy_total(buffer):
+    """Decode every display at once and return the sum of their values.
+
+    The patterns are found as runs of letters in the raw bytes and ORed
+    into masks in one go, giving a row of ten signals and four outputs per
+    display. Wire counts and digit scores are then computed for all the
+    rows together, using the scores directly in place of the mask tables.
     """
+    wire_bits = np.zeros(256, dtype=np.uint8)
+    wire_bits[np.frombuffer(b"abcdefg", dtype=np.uint8)] = 1 << np.arange(7, dtype=np.uint8)
+    score_digits = np.zeros(max(SCORE_DIGITS) + 1, dtype=np.int64)
+    score_digits[list(SCORE_DIGITS)] = list(SCORE_DIGITS.values())
+
+    bits = wire_bits[np.frombuffer(buffer, dtype=np.uint8)]
+    letters = bits != 0
+    starts = np.flatnonzero(letters & ~np.concatenate(([False], letters[:-1])))
+    if not starts.size:
+        return 0
+    masks = np.bitwise_or.reduceat(bits, starts).reshape(-1, 14)
+    lit = (masks[:, :, None] >> np.arange(7, dtype=np.uint8)) & 1
+    counts = lit[:, :10].sum(axis=1, dtype=np.int64)
+    digits = score_digits[(lit[:, 10:] * counts[:, None, :]).sum(axis=2)]
+    return int((digits @ np.array([1000, 100, 10, 1])).sum())
+
+def solve(stream):
+    if np is not None:
+        with open_buffer(stream) as buffer:
+            return numpy_total(buffer)
+    return sum(decode_line(bytes(line)) for line in lines(stream))
 
-    NUM_SEGMENTS = { 2: 1, 3: 7, 4: 4, 7: 8 }
-
-    def __init__(self, segment_sets):
-        self.segments_to_value = {}
-        self.value_to_segments = {}
-        self.analyse_segment_sets(segment_sets)
-
-    def _store_mapping(self, segment_set, value):
-        if value is not None:
-            self.segments_to_value[segment_set] = value
-            self.value_to_segments[value] = segment_set
-
-    def analyse_segment_sets(self, segment_sets):
-        self.simple_analysis(segment_sets)
-        self.advanced_analysis(segment_sets)
-
-    def simple_analysis(self, segment_sets):
-        for segment_set in (frozenset(i) for i in segment_sets):
-            self._store_mapping(segment_set, self.NUM_SEGMENTS.get(len(segment_set)))
-
-    def advanced_analysis(self, segment_sets):
-        for segment_set in (frozenset(i) for i in segment_sets):
-            if len(segment_set) == 6:
-                if len(segment_set & self.value_to_segments[1]) < 2:
-                    self._store_mapping(segment_set, 6)
-                elif len(segment_set & self.value_to_segments[4]) > 3:
-                    self._store_mapping(segment_set, 9)
-                else:
-                    self._store_mapping(segment_set, 0)
-            elif len(segment_set) == 5:
-                if len(segment_set & self.value_to_segments[1]) > 1:
-                    self._store_mapping(segment_set, 3)
-                elif len(segment_set & self.value_to_segments[4]) > 2:
-                    self._store_mapping(segment_set, 5)
-                else:
-                    self._store_mapping(segment_set, 2)
-
-    def get_multidigit_value(self, patterns):
-        total = 0
-        for pattern in (frozenset(i) for i in patterns):
-            total = total * 10 + self.segments_to_value[pattern]
-        return total
-
-
-total = 0
-for digits, outputs in ((d_s.split(), o_s.split()) for d_s, o_s in (line.split("|", 1) for line in stdin)):
-    mapper = Mapper(digits)
-    total += mapper.get_multidigit_value(outputs)
-
-print(f"Total={total}")
+if __name__ == "__main__":
+    print(f"Total={solve(stdin)}")
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3.10
 
 from collections import deque
+from pathlib import Path
+import sys
 from sys import stdin
 
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import digit_grid
+
 class NeighbourChecker:
 
     def __init__(self):
@@ -27,11 +33,14 @@ class NeighbourChecker:
                 if all(value < i for i in self._neighbours(x)):
                     yield value
 
-checker = NeighbourChecker()
-total_risk = 0
-for row in ([int(i) for i in line.strip()] for line in stdin):
-    total_risk += sum(i+1 for i in checker.find_local_minima(row))
-else:
-    total_risk += sum(i+1 for i in checker.find_local_minima(None))
+def solve(stream):
+    checker = NeighbourChecker()
+    total_risk = 0
+    for row in digit_grid(stream).rows():
+        total_risk += sum(i+1 for i in checker.find_local_minima(row))
+    else:
+        total_risk += sum(i+1 for i in checker.find_local_minima(None))
+    return total_risk
 
-print(f"Risk={total_risk}")
\ No newline at end of file
+if __name__ == "__main__":
+    print(f"Risk={solve(stdin)}")
@@ -1,51 +1,80 @@
 #!/usr/bin/env python3.10
 
-from collections import deque
+from heapq import nlargest
 from math import prod
+from pathlib import Path
+import re
 from sys import stdin
+import sys
 
-class HeightMap:
-
-    def __init__(self, iterable):
-        self.rows = list(iterable)
-
-    def _neighbours(self, x, y):
-        if y > 0:
-            yield (x, y-1)
-        if y < len(self.rows) - 1:
-            yield (x, y+1)
-        if x > 0:
-            yield (x-1, y)
-        if x < len(self.rows[y]) - 1:
-            yield (x+1, y)
-
-    def _neighbour_values(self, x, y):
-        for nx, ny in self._neighbours(x, y):
-            yield self.rows[ny][nx]
-
-    def find_local_minima(self):
-        for y in range(len(self.rows)):
-            for x in range(len(self.rows[y])):
-                value = self.rows[y][x]
-                if all(value < i for i in self._neighbour_values(x, y)):
-                    yield (x, y, value)
-
-    def get_basin_size(self, x, y):
-        to_check = set(((x, y),))
-        checked = set()
-        while True:
-            try:
-                point = to_check.pop()
-                checked.add(point)
-                for nx, ny in self._neighbours(*point):
-                    if (nx, ny) not in checked and self.rows[ny][nx] < 9:
-                        to_check.add((nx, ny))
-            except KeyError:
-                break
-        return len(checked)
-
-height_map = HeightMap([int(i) for i in line.strip()] for line in stdin)
-basin_sizes = []
-for x, y, value in height_map.find_local_minima():
-    basin_sizes.append(height_map.get_basin_size(x, y))
-print(f"Total basins={len(basin_sizes)} Top 3 product={prod(sorted(basin_sizes)[-3:])}")
+# Make the shared advent package importable when run directly as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from advent.inputs import iter_lines
+
+# Basins are just the connected areas of anything lower than 9, since each
+# one flows to a single low point, so there's no need to find the low points
+# at all. They're found with union-find a row at a time, keeping only the
+# runs of non-9 cells in the previous row. Each run in a new row joins up
+# with the runs above it which it overlaps, and any component from the
+# previous row which nothing in the new row joined can't grow any more, so
+# its size is final. Components are renumbered after each row, which keeps
+# everything in proportion to the width of the grid, however tall it is.
+
+def find_root(parent, cell):
+    while parent[cell] != cell:
+        # Path halving: point each cell visited at its grandparent.
+        parent[cell] = parent[parent[cell]]
+        cell = parent[cell]
+    return cell
+
+LOW_RUN_RE = re.compile(rb"[0-8]+")
+
+def stream_basin_sizes(lines):
+    "Yield the size of each basin as soon as it's complete, given the grid's rows as bytes"
+    above = []
+    sizes = []
+    for line in lines:
+        num_above = len(sizes)
+        parent = list(range(num_above))
+        runs = []
+        i = 0
+        for match in LOW_RUN_RE.finditer(line):
+            start, end = match.span()
+            node = len(parent)
+            parent.append(node)
+            sizes.append(end - start)
+            while i < len(above) and above[i][1] <= start:
+                i += 1
+            j = i
+            while j < len(above) and above[j][0] < end:
+                root_above = find_root(parent, above[j][2])
+                root = find_root(parent, node)
+                if root_above != root:
+                    parent[root_above] = root
+                    sizes[root] += sizes[root_above]
+                j += 1
+            runs.append((start, end, node))
+        open_roots = {find_root(parent, node) for start, end, node in runs}
+        for root in {find_root(parent, label) for label in range(num_above)} - open_roots:
+            yield sizes[root]
+        labels = {}
+        new_sizes = []
+        above = []
+        for start, end, node in runs:
+            root = find_root(parent, node)
+            if root not in labels:
+                labels[root] = len(new_sizes)
+                new_sizes.append(sizes[root])
+            above.append((start, end, labels[root]))
+        sizes = new_sizes
+    yield from sizes
+
+def top_product(sizes, count=3):
+    return prod(nlargest(count, sizes))
+
+def solve(stream):
+    return top_product(stream_basin_sizes(iter_lines(stream)))
+
+if __name__ == "__main__":
+    sizes = list(stream_basin_sizes(iter_lines(stdin)))
+    print(f"Total basins={len(sizes)} Top 3 product={top_product(sizes)}")